@@ -2,6 +2,15 @@ import tkinter as tk
 from tkinter import messagebox
 import random
 import os
+import sqlite3
+import math
+import sys
+import csv
+import argparse
+import hashlib
+import mmap
+import struct
+from concurrent.futures import ProcessPoolExecutor
 
 # Band name generation logic
 adjectives = ["Amazing", "Electric", "Funky", "Majestic", "Thunderous", "Mellow", "Cosmic", "Groovy", "Radiant", "Lunar", "Epic"]
@@ -14,11 +23,249 @@ genre_suffixes = {
     "default": ["Ensemble", "Crew"]
 }
 history_file = "band_names.txt"
+history_db = "band_names.db"
+
+# Optional Bloom filter for the used-name check: fixed memory, small false-positive rate
+use_bloom = False
+bloom_file = "band_names.bloom"
+bloom_capacity = 10_000_000
+bloom_fp_rate = 0.001
+bloom_max_bytes = None  # memory budget; caps the bit array if set
+
+# Persistent history: one row per used name, unique index gives O(1)-ish lookups
+class HistoryStore:
+    def __init__(self, path=history_db, legacy_file=history_file):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS names (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.conn.commit()
+        if legacy_file:
+            self.import_text(legacy_file)
+
+    def import_text(self, path, batch_size=50000):
+        # One-time import of the old band_names.txt, streamed in batches
+        done = self.conn.execute("SELECT value FROM meta WHERE key = 'imported'").fetchone()
+        if done or not os.path.exists(path):
+            return 0
+        before = self.count()
+        with open(path, "r") as f:
+            batch = []
+            for line in f:
+                name = line.strip()
+                if name:
+                    batch.append(name)
+                if len(batch) >= batch_size:
+                    self.add_many(batch, commit=False)
+                    batch = []
+            self.add_many(batch, commit=False)
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('imported', ?)", (path,))
+        self.conn.commit()
+        return self.count() - before
+
+    def __contains__(self, name):
+        return self.conn.execute("SELECT 1 FROM names WHERE name = ?", (name,)).fetchone() is not None
+
+    def add_many(self, names, commit=True):
+        self.conn.executemany("INSERT OR IGNORE INTO names (name) VALUES (?)", ((n,) for n in names))
+        if commit:
+            self.conn.commit()
+
+    def unused(self, names, chunk=500):
+        # Batched membership check, keeps candidate order
+        names = list(names)
+        used = set()
+        for i in range(0, len(names), chunk):
+            part = names[i:i + chunk]
+            marks = ",".join("?" * len(part))
+            used.update(r[0] for r in self.conn.execute(f"SELECT name FROM names WHERE name IN ({marks})", part))
+        return [n for n in names if n not in used]
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM names").fetchone()[0]
+
+    def max_id(self):
+        return self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM names").fetchone()[0]
+
+    # Keyset paging: seeks through the primary key, so any page costs the same however deep it is
+    def page_after(self, after_id, limit, contains=""):
+        sql, args = "SELECT id, name FROM names WHERE id > ?", [after_id]
+        if contains:
+            sql += " AND name LIKE ? ESCAPE '\\'"
+            args.append(_like_pattern(contains))
+        rows = self.conn.execute(sql + " ORDER BY id LIMIT ?", args + [limit])
+        return rows.fetchall()
+
+    def page_before(self, before_id, limit, contains=""):
+        sql, args = "SELECT id, name FROM names WHERE id < ?", [before_id]
+        if contains:
+            sql += " AND name LIKE ? ESCAPE '\\'"
+            args.append(_like_pattern(contains))
+        rows = self.conn.execute(sql + " ORDER BY id DESC LIMIT ?", args + [limit])
+        return rows.fetchall()[::-1]
+
+    def iter_names(self, batch_size=1000):
+        cur = self.conn.execute("SELECT name FROM names ORDER BY id")
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            for r in rows:
+                yield r[0]
+
+def _like_pattern(text):
+    text = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{text}%"
+
+# On-disk layout: 24-byte header (magic, bit count, hash count, last history id included) then the raw bit array,
+# so the file can be mmap'd as-is and opening it costs no parsing.
+class BloomFilter:
+    MAGIC = b"BNBLOOM1"
+    HEADER = struct.Struct("<8sQII")
+
+    def __init__(self, path, readonly=False):
+        self.path = path
+        self.file = open(path, "rb" if readonly else "r+b")
+        access = mmap.ACCESS_READ if readonly else mmap.ACCESS_WRITE
+        self.map = mmap.mmap(self.file.fileno(), 0, access=access)
+        magic, self.bits, self.hashes, self.synced_id = self.HEADER.unpack_from(self.map, 0)
+        if magic != self.MAGIC:
+            raise ValueError(f"{path} is not a band name Bloom filter")
+
+    @staticmethod
+    def sizing(capacity, fp_rate, max_bytes=None):
+        bits = max(8, int(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        if max_bytes:
+            bits = min(bits, max_bytes * 8)
+        hashes = max(1, round(bits / capacity * math.log(2)))
+        return bits, hashes
+
+    @classmethod
+    def create(cls, path, capacity=bloom_capacity, fp_rate=bloom_fp_rate, max_bytes=bloom_max_bytes):
+        bits, hashes = cls.sizing(capacity, fp_rate, max_bytes)
+        with open(path, "wb") as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, bits, hashes, 0))
+            f.truncate(cls.HEADER.size + (bits + 7) // 8)
+        return cls(path)
+
+    def _positions(self, name):
+        digest = hashlib.blake2b(name.encode(), digest_size=16).digest()
+        h1, h2 = struct.unpack("<QQ", digest)
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def __contains__(self, name):
+        base = self.HEADER.size
+        m = self.map
+        return all(m[base + (p >> 3)] & (1 << (p & 7)) for p in self._positions(name))
+
+    def unused(self, names):
+        return [n for n in names if n not in self]
+
+    def add_many(self, names):
+        base = self.HEADER.size
+        m = self.map
+        for name in names:
+            for p in self._positions(name):
+                m[base + (p >> 3)] |= 1 << (p & 7)
+
+    def sync(self, store, batch=10000):
+        # Add every history row newer than the header's id, so names recorded while the filter
+        # was off (or by another run without it) are never missed
+        while True:
+            rows = store.page_after(self.synced_id, batch)
+            if not rows:
+                break
+            self.add_many(name for _, name in rows)
+            self.synced_id = rows[-1][0]
+        self.HEADER.pack_into(self.map, 0, self.MAGIC, self.bits, self.hashes, self.synced_id)
+
+    def flush(self):
+        self.map.flush()
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+def open_bloom(path=bloom_file, store=None):
+    # Map the filter (creating it the first time) and catch it up with the SQLite history
+    bloom = BloomFilter(path) if os.path.exists(path) else BloomFilter.create(path)
+    if store is not None:
+        bloom.sync(store)
+        bloom.flush()
+    return bloom
+
+_store = None
+_bloom = None
+
+# 0..n-1 in a uniformly shuffled order; n is at most len(adjectives) * len(suffixes), so the list is tiny
+def shuffled_indices(n, rng=random):
+    return rng.sample(range(n), n) if n > 0 else []
+
+# Every adjective x suffix combination exactly once, in shuffled order
+def name_candidates(city, pet, suffixes, rng=random):
+    for i in shuffled_indices(len(adjectives) * len(suffixes), rng):
+        adj, suf = adjectives[i // len(suffixes)], suffixes[i % len(suffixes)]
+        yield f"{adj} {city} {pet} {suf}"
+
+# Bulk API: up to num fresh names (all of them if num is None), skipping used ones in batches.
+# Returns (names, exhausted); exhausted is True when the space ran out before num was reached.
+def fresh_names(city, pet, suffixes, num, used, batch_size=1000, rng=random):
+    names = []
+    batch = []
+    for cand in name_candidates(city, pet, suffixes, rng):
+        batch.append(cand)
+        if len(batch) >= batch_size:
+            names.extend(_unused(used, batch))
+            batch = []
+            if num is not None and len(names) >= num:
+                return names[:num], False
+    names.extend(_unused(used, batch))
+    if num is None:
+        return names, True
+    return names[:num], len(names) < num
+
+def _unused(used, names):
+    if hasattr(used, "unused"):
+        return used.unused(names)
+    return [n for n in names if n not in used]
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = HistoryStore()
+    return _store
+
+def get_bloom():
+    global _bloom
+    if _bloom is None:
+        _bloom = open_bloom(bloom_file, get_store())
+    return _bloom
+
+# What the generator checks names against: the Bloom filter if enabled, else the indexed store
+def get_used():
+    return get_bloom() if use_bloom else get_store()
+
+def record_names(names):
+    get_store().add_many(names)
+    if use_bloom:
+        get_bloom().sync(get_store())
+
+def suffixes_for(genre):
+    return genre_suffixes.get(genre.lower().strip(), genre_suffixes["default"])
+
+# Tk-free generation core, shared by the GUI and the bulk CLI
+def make_band_names(city, pet, genre, num, used):
+    city, pet = city.strip(), pet.strip()
+    if not city or not pet:
+        raise ValueError("City and pet fields cannot be blank.")
+    if num is not None and num < 0:
+        raise ValueError("Number of names cannot be negative.")
+    return fresh_names(city, pet, suffixes_for(genre), num, used)
 
 def generate_names():
     city = city_entry.get().strip()
     pet = pet_entry.get().strip()
-    genre = genre_entry.get().lower().strip()
+    genre = genre_entry.get()
     try:
         num = int(num_entry.get())
         if num < 1 or num > 5:
@@ -30,71 +277,249 @@ def generate_names():
         messagebox.showerror("Error", "City and pet fields cannot be blank.")
         return
 
-    if genre not in genre_suffixes:
-        suffixes = genre_suffixes["default"]
-    else:
-        suffixes = genre_suffixes[genre]
-
     if city.lower() == "paris" or pet.lower() == "dragon":
         messagebox.showinfo("Bonus", "You have a truly legendary band setup!")
 
-    names = set()
-    used_names = set()
-    if os.path.exists(history_file):
-        with open(history_file, "r") as f:
-            used_names = set(line.strip() for line in f)
-
-    attempts = 0
-    while len(names) < num and attempts < 12:
-        adj = random.choice(adjectives)
-        suf = random.choice(suffixes)
-        name = f"{adj} {city} {pet} {suf}"
-        if name not in used_names and name not in names:
-            names.add(name)
-        attempts += 1
+    names, exhausted = make_band_names(city, pet, genre, num, get_used())
+    if exhausted:
+        messagebox.showwarning("Space exhausted", f"Only {len(names)} unused name(s) left for {city} / {pet}.")
 
     result_box.delete(0, tk.END)
     for n in names:
         result_box.insert(tk.END, n)
 
-    with open(history_file, "a") as f:
-        for n in names:
-            f.write(f"{n}\n")
+    record_names(names)
+
+# History window: only the visible page is ever fetched from the store or put in the Listbox
+class HistoryViewer:
+    def __init__(self, master, store, rows=20):
+        self.store = store
+        self.rows = rows
+        self.page = []  # (id, name) pairs currently shown
+        self.query = ""
+        self._search_job = None
+
+        self.win = tk.Toplevel(master)
+        self.win.title("Band Name History")
+        tk.Label(self.win, text="Search:").grid(row=0, column=0, sticky="e")
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *_: self.schedule_search())
+        tk.Entry(self.win, textvariable=self.search_var, width=30).grid(row=0, column=1, sticky="w")
+        self.listbox = tk.Listbox(self.win, width=50, height=rows)
+        self.listbox.grid(row=1, column=0, columnspan=2, padx=6, pady=6)
+        self.scroll = tk.Scrollbar(self.win, command=self.on_scroll)
+        self.scroll.grid(row=1, column=2, sticky="ns")
+        self.status = tk.Label(self.win, anchor="w")
+        self.status.grid(row=2, column=0, columnspan=3, sticky="w", padx=6)
+        self.listbox.bind("<MouseWheel>", lambda e: self.step(-1 if e.delta > 0 else 1))
+        self.listbox.bind("<Button-4>", lambda e: self.step(-1))
+        self.listbox.bind("<Button-5>", lambda e: self.step(1))
+        self.listbox.bind("<Prior>", lambda e: self.step(-self.rows))
+        self.listbox.bind("<Next>", lambda e: self.step(self.rows))
+        self.show(self.store.page_after(0, self.rows))
+
+    def show(self, page):
+        if not page:
+            if not self.page:
+                self.listbox.delete(0, tk.END)
+                self.listbox.insert(tk.END, "No band names yet." if not self.query else "No matches.")
+            return
+        self.page = page
+        self.listbox.delete(0, tk.END)
+        for _, name in page:
+            self.listbox.insert(tk.END, name)
+        top = self.store.max_id() or 1
+        if self.query:
+            self.scroll.set(0, 1)
+            self.status.config(text=f"Matches for '{self.query}'")
+        else:
+            self.scroll.set((page[0][0] - 1) / top, page[-1][0] / top)
+            self.status.config(text=f"Entries {page[0][0]}-{page[-1][0]} of ~{top}")
+
+    def step(self, lines):
+        if not self.page:
+            return "break"
+        if lines > 0:
+            more = self.store.page_after(self.page[-1][0], lines, self.query)
+            page = (self.page + more)[-self.rows:] if more else []
+        else:
+            more = self.store.page_before(self.page[0][0], -lines, self.query)
+            page = (more + self.page)[:self.rows] if more else []
+        self.show(page)
+        return "break"
+
+    def on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            if self.query:
+                return
+            start = int(float(amount) * self.store.max_id())
+            page = self.store.page_after(max(0, start), self.rows)
+            if len(page) < self.rows:
+                page = self.store.page_before(self.store.max_id() + 1, self.rows)
+            self.show(page)
+        elif action == "scroll":
+            self.step(int(amount) * (self.rows if unit == "pages" else 1))
+
+    def schedule_search(self):
+        # Debounce: query once the user pauses typing
+        if self._search_job:
+            self.win.after_cancel(self._search_job)
+        self._search_job = self.win.after(200, self.run_search)
+
+    def run_search(self):
+        self._search_job = None
+        self.query = self.search_var.get().strip()
+        self.page = []
+        self.show(self.store.page_after(0, self.rows, self.query))
 
 def show_history():
-    if os.path.exists(history_file):
-        with open(history_file, "r") as f:
-            all_names = [line.strip() for line in f]
-        history_text = "\n".join(all_names)
-        messagebox.showinfo("Band Name History", history_text if history_text else "No band names yet.")
+    HistoryViewer(root, get_store())
+
+# Bulk CLI: CSV rows of (city, pet, genre, count) -> CSV rows of (city, pet, genre, name)
+_worker_used = None
+
+def _init_worker(db_path, bloom_path):
+    global _worker_used
+    if bloom_path:
+        _worker_used = BloomFilter(bloom_path, readonly=True)
+    elif db_path:
+        _worker_used = HistoryStore(db_path, legacy_file=None)
     else:
-        messagebox.showinfo("Band Name History", "No band names yet.")
+        _worker_used = set()
+
+# History plus the names already handed out earlier in the same chunk
+class _ChunkUsed:
+    def __init__(self, base):
+        self.base = base
+        self.seen = set()
+
+    def unused(self, names):
+        return [n for n in _unused(self.base, names) if n not in self.seen]
+
+def _bulk_chunk(rows):
+    # One (city, pet, genre, count, names, exhausted) group per valid input row
+    out = []
+    used = _ChunkUsed(_worker_used)
+    for city, pet, genre, count in rows:
+        try:
+            count = int(count)
+            names, short = make_band_names(city, pet, genre, count, used)
+        except ValueError:
+            continue
+        used.seen.update(names)
+        out.append((city, pet, genre, count, names, short))
+    return out
+
+def _read_chunks(f, chunk_rows):
+    chunk = []
+    for row in csv.reader(f):
+        if len(row) < 4 or row[3].strip().lower() == "count":
+            continue
+        chunk.append(row[:4])
+        if len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def bulk_generate(in_path, out_path, workers=None, chunk_rows=2000, db_path=history_db, record=True, bloom_path=None):
+    # Only a bounded number of chunks are in flight at once, so memory stays flat on huge inputs
+    workers = workers or os.cpu_count() or 1
+    store = HistoryStore(db_path) if db_path else None
+    bloom = open_bloom(bloom_path, store) if bloom_path and store is not None else None
+    check = bloom if bloom is not None else store
+    written = exhausted = 0
+    with open(in_path, newline="") as fin, open(out_path, "w", newline="") as fout, \
+            ProcessPoolExecutor(workers, initializer=_init_worker,
+                                initargs=(db_path, bloom_path if bloom is not None else None)) as pool:
+        writer = csv.writer(fout)
+        writer.writerow(["city", "pet", "genre", "name"])
+        pending = []
+        # Names handed out earlier in this run. A recorded history already holds them; otherwise they
+        # are kept here, which is bounded by len(adjectives) x suffixes per city/pet pair in the input
+        keep_run = check is None or not record
+        run_used = _ChunkUsed(check if check is not None else set()) if keep_run else check
+        def drain(limit):
+            nonlocal written, exhausted
+            while len(pending) > limit:
+                accepted = _ChunkUsed(run_used)
+                for city, pet, genre, count, names, short in pending.pop(0).result():
+                    # Chunks run in parallel, so another chunk may have claimed some of these
+                    # names first; drop those and top the row up from what is still free
+                    names = accepted.unused(names)
+                    if len(names) < count and not short:
+                        accepted.seen.update(names)
+                        more, short = make_band_names(city, pet, genre, count - len(names), accepted)
+                        names += more
+                    accepted.seen.update(names)
+                    writer.writerows((city, pet, genre, n) for n in names)
+                    written += len(names)
+                    exhausted += short
+                if keep_run:
+                    run_used.seen.update(accepted.seen)
+                else:
+                    store.add_many(accepted.seen)
+                    if bloom is not None:
+                        bloom.sync(store)
+        for chunk in _read_chunks(fin, chunk_rows):
+            pending.append(pool.submit(_bulk_chunk, chunk))
+            drain(workers * 2)
+        drain(0)
+    if bloom is not None:
+        bloom.flush()
+    return written, exhausted
+
+def bulk_cli(argv):
+    parser = argparse.ArgumentParser(description="Generate band names in bulk from a CSV of city,pet,genre,count rows.")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-rows", type=int, default=2000)
+    parser.add_argument("--db", default=history_db, help="history database used to skip names already taken")
+    parser.add_argument("--no-history", action="store_true", help="don't check or record history")
+    parser.add_argument("--bloom", nargs="?", const=bloom_file, default=None,
+                        help="check names against a memory-mapped Bloom filter instead of the database")
+    args = parser.parse_args(argv)
+    if args.bloom and args.no_history:
+        parser.error("--bloom needs the history database; it can't be combined with --no-history")
+    db_path = None if args.no_history else args.db
+    written, exhausted = bulk_generate(args.input, args.output, args.workers, args.chunk_rows, db_path,
+                                       bloom_path=args.bloom)
+    print(f"Wrote {written} names to {args.output} ({exhausted} rows ran out of unused names)")
 
 # Tkinter UI setup
-root = tk.Tk()
-root.title("Band Name Generator")
+def run_gui():
+    global root, city_entry, pet_entry, genre_entry, num_entry, result_box
+    root = tk.Tk()
+    root.title("Band Name Generator")
+
+    tk.Label(root, text="City you grew up in:").grid(row=0, column=0, sticky="e")
+    city_entry = tk.Entry(root)
+    city_entry.grid(row=0, column=1)
 
-tk.Label(root, text="City you grew up in:").grid(row=0, column=0, sticky="e")
-city_entry = tk.Entry(root)
-city_entry.grid(row=0, column=1)
+    tk.Label(root, text="Your pet's name:").grid(row=1, column=0, sticky="e")
+    pet_entry = tk.Entry(root)
+    pet_entry.grid(row=1, column=1)
 
-tk.Label(root, text="Your pet's name:").grid(row=1, column=0, sticky="e")
-pet_entry = tk.Entry(root)
-pet_entry.grid(row=1, column=1)
+    tk.Label(root, text="Favorite genre (rock/pop/jazz/metal/indie):").grid(row=2, column=0, sticky="e")
+    genre_entry = tk.Entry(root)
+    genre_entry.grid(row=2, column=1)
 
-tk.Label(root, text="Favorite genre (rock/pop/jazz/metal/indie):").grid(row=2, column=0, sticky="e")
-genre_entry = tk.Entry(root)
-genre_entry.grid(row=2, column=1)
+    tk.Label(root, text="How many suggestions? (1-5):").grid(row=3, column=0, sticky="e")
+    num_entry = tk.Entry(root)
+    num_entry.grid(row=3, column=1)
+    num_entry.insert(0, "3")
 
-tk.Label(root, text="How many suggestions? (1-5):").grid(row=3, column=0, sticky="e")
-num_entry = tk.Entry(root)
-num_entry.grid(row=3, column=1)
-num_entry.insert(0, "3")
+    tk.Button(root, text="Generate Band Names", command=generate_names).grid(row=4, column=0, columnspan=2, pady=8)
+    tk.Button(root, text="Show History", command=show_history).grid(row=5, column=0, columnspan=2, pady=3)
 
-tk.Button(root, text="Generate Band Names", command=generate_names).grid(row=4, column=0, columnspan=2, pady=8)
-tk.Button(root, text="Show History", command=show_history).grid(row=5, column=0, columnspan=2, pady=3)
+    result_box = tk.Listbox(root, width=45, height=6)
+    result_box.grid(row=6, column=0, columnspan=2, padx=10, pady=10)
 
-result_box = tk.Listbox(root, width=45, height=6)
-result_box.grid(row=6, column=0, columnspan=2, padx=10, pady=10)
+    root.mainloop()
 
-root.mainloop()
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        bulk_cli(sys.argv[1:])
+    else:
+        run_gui()
@@ -1,24 +1,44 @@
 import tkinter as tk
 from tkinter import messagebox, simpledialog, filedialog
-from datetime import datetime, timedelta
-import json
+from datetime import datetime
+from bisect import bisect_left
+import os
+import sys
+from todo_model import (Task, TaskIndex, SqliteTaskStore, TaskJournal, Autosaver, ReminderScheduler,
+                        parse_due, matches_filter, write_snapshot, read_snapshot, replay_journal, AUTOSAVE_FILE)
 
 THEMES = [
-    {"bg":"#faf3e3","btn":"#aee1f9","entry":"#ffeebb","fg":"#253456","done":"#bcbcbc","highlight":"#4994bf"},
-    {"bg":"#232946","btn":"#eeb1b1","entry":"#232946","fg":"#fff1eb","done":"#5c5b5e","highlight":"#f4d35e"}
+    {"bg":"#faf3e3","btn":"#aee1f9","entry":"#ffeebb","fg":"#253456","done":"#bcbcbc","highlight":"#4994bf","overdue":"#d64545"},
+    {"bg":"#232946","btn":"#eeb1b1","entry":"#232946","fg":"#fff1eb","done":"#5c5b5e","highlight":"#f4d35e","overdue":"#ff7b7b"}
 ]
 
+VISIBLE_ROWS = 10
+
 class TaskManagerApp:
-    def __init__(self, root):
+    def __init__(self, root, db_path=None):
         self.root = root
         self.theme = 0
         self.root.title("Day 10: To-Do List/Task Manager Pro")
         self.root.configure(bg=THEMES[self.theme]["bg"])
 
-        self.tasks = []  # Each task is dict: {text, done, priority, due, category}
+        # In-memory indexes by default; with db_path the tasks live in SQLite and Save/Load become export/import
+        self.index = SqliteTaskStore(db_path) if db_path else TaskIndex()
         self.filter_var = tk.StringVar(value="All")
         self.search_var = tk.StringVar()
         self.stats_var = tk.StringVar()
+        self._search_job = None
+        self.reminder_var = tk.StringVar()
+        self.journal = None
+        self._loading = None
+        self._applying = False  # set while the loader itself is filling the index
+        self._flush_job = None
+        # The SQLite backend is already durable; the in-memory one is autosaved in the background
+        self.autosaver = None
+        if not isinstance(self.index, SqliteTaskStore):
+            self.autosaver = Autosaver(AUTOSAVE_FILE, lambda: list(self.index.all()))
+        self._load_dirty = False
+        self.index.listeners.append(self.on_model_change)
+        self.search_var.trace_add("write", lambda *_: self.schedule_search())
 
         self.task_entry = tk.Entry(root, font=("Consolas",13), bg=THEMES[self.theme]["entry"], fg=THEMES[self.theme]["fg"], width=32)
         self.task_entry.grid(row=0, column=0, columnspan=2, padx=5, pady=7)
@@ -39,8 +59,21 @@ class TaskManagerApp:
         tk.Button(root, text="Save", command=self.save_tasks, font=("Helvetica",11), bg=THEMES[self.theme]["btn"], fg=THEMES[self.theme]["fg"]).grid(row=1, column=3)
         tk.Button(root, text="Load", command=self.load_tasks, font=("Helvetica",11), bg=THEMES[self.theme]["btn"], fg=THEMES[self.theme]["fg"]).grid(row=1, column=4)
 
-        self.listbox = tk.Listbox(root, width=52, height=10, font=("Consolas",12), bg="#eaf6f6", activestyle="none")
+        # Virtual list: the Listbox only ever holds the visible window of self.view
+        self.view = []      # ids of the filtered tasks, in display order
+        self.top = 0        # index in self.view of the first visible row
+        self.rendered = []  # (id, line, colour state) currently shown in each Listbox row
+        self.listbox = tk.Listbox(root, width=52, height=VISIBLE_ROWS, font=("Consolas",12), bg="#eaf6f6", activestyle="none")
         self.listbox.grid(row=2, column=0, columnspan=5, padx=7, pady=4)
+        self.scrollbar = tk.Scrollbar(root, command=self.on_scroll)
+        self.scrollbar.grid(row=2, column=5, sticky="ns", pady=4)
+        self.listbox.bind("<MouseWheel>", lambda e: self.scroll_by(-1 if e.delta > 0 else 1))
+        self.listbox.bind("<Button-4>", lambda e: self.scroll_by(-1))
+        self.listbox.bind("<Button-5>", lambda e: self.scroll_by(1))
+        self.listbox.bind("<Prior>", lambda e: self.scroll_by(-VISIBLE_ROWS))
+        self.listbox.bind("<Next>", lambda e: self.scroll_by(VISIBLE_ROWS))
+        self.listbox.bind("<Up>", lambda e: self.move_selection(-1))
+        self.listbox.bind("<Down>", lambda e: self.move_selection(1))
         self.listbox.bind("<Double-Button-1>", lambda e: self.toggle_done())
         self.listbox.bind("<Delete>", lambda e: self.delete_task())
         self.listbox.bind("<Return>", lambda e: self.edit_task_dialog())
@@ -52,8 +85,14 @@ class TaskManagerApp:
 
         self.stats_label = tk.Label(root, textvariable=self.stats_var, font=("Helvetica",12,"bold"), bg=THEMES[self.theme]["bg"], fg=THEMES[self.theme]["highlight"], anchor="w")
         self.stats_label.grid(row=4, column=0, columnspan=5, sticky="w", padx=8)
+        self.reminder_label = tk.Label(root, textvariable=self.reminder_var, font=("Helvetica",11), bg=THEMES[self.theme]["bg"], fg=THEMES[self.theme]["overdue"], anchor="w")
+        self.reminder_label.grid(row=5, column=0, columnspan=5, sticky="w", padx=8)
+        self.reminders = ReminderScheduler(root, self.index, self.on_reminders)
+        self.reminders.rebuild()
         self.update_view()
         self.update_stats()
+        if self.autosaver and os.path.exists(AUTOSAVE_FILE):
+            self.restore_autosave()
 
     def switch_theme(self):
         self.theme = 1 - self.theme
@@ -69,74 +108,65 @@ class TaskManagerApp:
             elif isinstance(w, tk.Listbox):
                 w.config(bg="#eaf6f6")
         self.listbox.config(bg="#eaf6f6")
+        # Row colours come from the theme, so every visible row has to be redrawn
+        self.listbox.delete(0, tk.END)
+        self.rendered = []
+        self.render()
 
     def add_task(self):
         text = self.task_entry.get().strip()
         if not text:
             return
-        due_str = simpledialog.askstring("Due Date", "Due date (YYYY-MM-DD) or blank for none:")
-        try:
-            due = datetime.strptime(due_str, "%Y-%m-%d") if due_str else None
-        except:
-            due = None
+        due = parse_due(simpledialog.askstring("Due Date", "Due date (YYYY-MM-DD) or blank for none:"))
         prio = simpledialog.askstring("Priority", "Priority (High/Medium/Low):")
         if prio not in {"High","Medium","Low"}:
             prio = "Medium"
         cat = simpledialog.askstring("Category", "Category/tag (optional):") or ""
-        self.tasks.append({"text": text, "done": False, "priority": prio, "due": due, "category": cat})
+        tid = self.index.add(Task(text, False, prio, due, cat))
         self.task_entry.delete(0, tk.END)
-        self.update_view()
+        self.patch_view(tid)
         self.update_stats()
 
     def edit_task_dialog(self):
-        sel = self.listbox.curselection()
-        if not sel: return
-        idx = sel[0]
-        task = self.filtered_tasks()[idx]
-        newtext = simpledialog.askstring("Edit Task", "Task text:", initialvalue=task["text"])
-        due_str = simpledialog.askstring("Edit Due", "Due date (YYYY-MM-DD):", initialvalue=task["due"].strftime("%Y-%m-%d") if task["due"] else "")
-        try:
-            due = datetime.strptime(due_str, "%Y-%m-%d") if due_str else None
-        except:
-            due = None
-        prio = simpledialog.askstring("Priority", "Edit priority:", initialvalue=task["priority"]) or "Medium"
-        cat = simpledialog.askstring("Category", "Edit category/tag:", initialvalue=task["category"]) or ""
-        # Find original global task
-        for t in self.tasks:
-            if t is task:
-                t.update({"text": newtext, "due": due, "priority": prio, "category": cat})
-        self.update_view()
+        tid = self.selected_id()
+        if tid is None: return
+        task = self.index.get(tid)
+        newtext = simpledialog.askstring("Edit Task", "Task text:", initialvalue=task.text)
+        if newtext is None:  # cancelled; text can't be NULL in the SQLite store
+            return
+        due = parse_due(simpledialog.askstring("Edit Due", "Due date (YYYY-MM-DD):", initialvalue=task.due_str()))
+        prio = simpledialog.askstring("Priority", "Edit priority:", initialvalue=task.priority) or "Medium"
+        cat = simpledialog.askstring("Category", "Edit category/tag:", initialvalue=task.category) or ""
+        self.index.update(tid, text=newtext, due=due, priority=prio, category=cat)
+        self.patch_view(tid)
         self.update_stats()
 
     def delete_task(self):
-        sel = self.listbox.curselection()
-        if not sel: return
-        idx = sel[0]
-        task = self.filtered_tasks()[idx]
-        for i, t in enumerate(self.tasks):
-            if t is task:
-                del self.tasks[i]
-                break
-        self.update_view()
+        tid = self.selected_id()
+        if tid is None: return
+        self.index.discard(tid)
+        self.patch_view(tid)
         self.update_stats()
 
     def toggle_done(self):
-        sel = self.listbox.curselection()
-        if not sel: return
-        idx = sel[0]
-        task = self.filtered_tasks()[idx]
-        for t in self.tasks:
-            if t is task:
-                t["done"] = not t["done"]
-        self.update_view()
+        tid = self.selected_id()
+        if tid is None: return
+        self.index.update(tid, done=not self.index.get(tid).done)
+        self.patch_view(tid)
         self.update_stats()
 
-    def copy_task(self):
+    def selected_id(self):
+        # Row -> id through what render() last put on screen
         sel = self.listbox.curselection()
-        if not sel: return
-        idx = sel[0]
-        task = self.filtered_tasks()[idx]
-        text = task["text"]
+        if not sel or sel[0] >= len(self.rendered):
+            return None
+        return self.rendered[sel[0]][0]
+
+    def copy_task(self):
+        tid = self.selected_id()
+        if tid is None: return
+        task = self.index.get(tid)
+        text = task.text
         self.root.clipboard_clear()
         self.root.clipboard_append(text)
         self.root.update()
@@ -145,64 +175,205 @@ class TaskManagerApp:
     def filtered_tasks(self):
         q = self.search_var.get().strip().lower()
         f = self.filter_var.get()
-        now = datetime.now()
-        def test(t):
-            return (q in t["text"].lower()) and (
-                f=="All"
-                or (f=="High" and t["priority"]=="High")
-                or (f=="Medium" and t["priority"]=="Medium")
-                or (f=="Low" and t["priority"]=="Low")
-                or (f=="Done" and t["done"])
-                or (f=="Not done" and not t["done"])
-                or (f=="Today" and t["due"] and t["due"].date()==now.date())
-                or (f=="Overdue" and t["due"] and t["due"]<now and not t["done"])
-            )
-        return [t for t in self.tasks if test(t)]
+        return self.index.filtered(f, q, datetime.now())
+
+    def schedule_search(self):
+        # Debounced live search while typing
+        if self._search_job:
+            self.root.after_cancel(self._search_job)
+        self._search_job = self.root.after(150, self.run_search)
+
+    def run_search(self):
+        self._search_job = None
+        self.top = 0
+        self.update_view()
+
+    def format_task(self, t):
+        tag = "[✓]" if t.done else "[ ]"
+        prio = f'({t.priority})'
+        due = f'[{t.due_str()}]' if t.due else ""
+        cat = f'#{t.category}' if t.category else ""
+        return f'{tag} {t.text} {prio} {due} {cat}'
 
     def update_view(self):
-        self.listbox.delete(0, tk.END)
-        for t in self.filtered_tasks():
-            tag = "[✓]" if t["done"] else "[ ]"
-            prio = f'({t["priority"]})'
-            due = f'[{t["due"].strftime("%Y-%m-%d")}]' if t["due"] else ""
-            cat = f'#{t["category"]}' if t["category"] else ""
-            line = f'{tag} {t["text"]} {prio} {due} {cat}'
-            self.listbox.insert(tk.END, line)
-            if t["done"]:
-                self.listbox.itemconfig(tk.END, {'fg': THEMES[self.theme]["done"]})
+        # Full refilter, for filter/search changes and loads
+        self.view = self.filtered_tasks()
+        self.top = max(0, min(self.top, len(self.view) - VISIBLE_ROWS))
+        self.render()
+
+    def patch_view(self, tid):
+        # After one task changed, add or drop just that id; self.view is in id order
+        i = bisect_left(self.view, tid)
+        present = i < len(self.view) and self.view[i] == tid
+        task = self.index.get(tid)
+        keep = task is not None and matches_filter(task, self.filter_var.get(), self.search_var.get().strip().lower(), datetime.now())
+        if keep and not present:
+            self.view.insert(i, tid)
+        elif present and not keep:
+            del self.view[i]
+        self.top = max(0, min(self.top, len(self.view) - VISIBLE_ROWS))
+        self.render()
+
+    def render(self):
+        # Format only the visible rows and patch just the ones whose text or state changed
+        sel = self.listbox.curselection()
+        tasks = [self.index.get(tid) for tid in self.view[self.top:self.top + VISIBLE_ROWS]]
+        today = datetime.now().toordinal()
+        rows = [(t.id, self.format_task(t), "done" if t.done else "overdue" if t.due and t.due <= today else "") for t in tasks]
+        if len(self.rendered) > len(rows):
+            self.listbox.delete(len(rows), tk.END)
+            del self.rendered[len(rows):]
+        for i, row in enumerate(rows):
+            if i < len(self.rendered) and self.rendered[i] == row:
+                continue
+            if i < len(self.rendered):
+                self.listbox.delete(i)
+            self.listbox.insert(i, row[1])
+            if row[2]:
+                self.listbox.itemconfig(i, {'fg': THEMES[self.theme][row[2]]})
+        self.rendered = rows
+        if sel and sel[0] < len(rows):
+            self.listbox.selection_set(sel[0])
+        total = len(self.view) or 1
+        self.scrollbar.set(self.top / total, min(1.0, (self.top + VISIBLE_ROWS) / total))
+
+    def scroll_by(self, lines):
+        top = max(0, min(self.top + lines, len(self.view) - VISIBLE_ROWS))
+        if top != self.top:
+            self.top = top
+            self.render()
+        return "break"
+
+    def on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_by(int(float(amount) * len(self.view)) - self.top)
+        elif action == "scroll":
+            self.scroll_by(int(amount) * (VISIBLE_ROWS if unit == "pages" else 1))
+
+    def move_selection(self, step):
+        sel = self.listbox.curselection()
+        row = (sel[0] if sel else -1) + step
+        if row < 0 or row >= VISIBLE_ROWS:
+            self.scroll_by(step)
+            row = max(0, min(row, VISIBLE_ROWS - 1))
+        row = min(row, len(self.rendered) - 1)
+        if row >= 0:
+            self.listbox.selection_clear(0, tk.END)
+            self.listbox.selection_set(row)
+            self.listbox.activate(row)
+        return "break"
 
     def update_stats(self):
-        done = sum(t["done"] for t in self.tasks)
-        notdone = len(self.tasks)-done
-        overdue = sum(t["due"] and t["due"]<datetime.now() and not t["done"] for t in self.tasks)
-        today = sum(t["due"] and t["due"].date()==datetime.now().date() for t in self.tasks)
+        now = datetime.now()
+        done, notdone, overdue, today = self.index.stats(now)
         self.stats_var.set(f"Done: {done} | Not done: {notdone} | Overdue: {overdue} | Due today: {today}")
 
+    def on_reminders(self, ids):
+        # Only the Today/Overdue views change membership; otherwise render() just recolours visible rows
+        if self.filter_var.get() in ("Today", "Overdue"):
+            self.update_view()
+        else:
+            self.render()
+        self.update_stats()
+        if ids:
+            names = ", ".join(self.index.get(tid).text for tid in ids[:3])
+            more = f" (+{len(ids) - 3} more)" if len(ids) > 3 else ""
+            self.reminder_var.set(f"⏰ Now due: {names}{more}")
+            self.root.bell()
+
+    def on_model_change(self, op, tid, payload):
+        if self._applying:
+            return
+        if self._loading:
+            # An autosave now would write the half-loaded list; finish_load() catches up
+            self._load_dirty = True
+            return
+        if self.autosaver:
+            self.autosaver.mark_dirty()
+        if isinstance(self.index, SqliteTaskStore):
+            # Coalesce a burst of edits into one commit
+            if self._flush_job:
+                self.root.after_cancel(self._flush_job)
+            self._flush_job = self.root.after(200, self.index.flush)
+        elif self.journal:
+            self.journal.record(op, tid, payload)
+            if self.journal.pending >= self.journal.compact_every:
+                self.journal.compact_in_background(list(self.index.all()))
+
     def save_tasks(self):
-        fname = filedialog.asksaveasfilename(defaultextension=".json")
+        fname = filedialog.asksaveasfilename(defaultextension=".ndjson")
         if fname:
-            with open(fname,"w") as f:
-                data = []
-                for t in self.tasks:
-                    j = t.copy()
-                    j["due"] = j["due"].strftime("%Y-%m-%d") if j["due"] else None
-                    data.append(j)
-                json.dump(data, f)
+            if isinstance(self.index, SqliteTaskStore):
+                write_snapshot(fname, self.index.all(), 0)
+                messagebox.showinfo("Saved", f"Tasks exported to {fname}")
+                return
+            # Snapshot now, then keep journaling every change to this file
+            if self.journal:
+                self.journal.close()
+            self.journal = TaskJournal(fname)
+            self.journal.compact(self.index.all())
             messagebox.showinfo("Saved", f"Tasks saved to {fname}")
 
     def load_tasks(self):
-        fname = filedialog.askopenfilename(filetypes=[("JSON files","*.json")])
+        fname = filedialog.askopenfilename(filetypes=[("Task files","*.ndjson *.json")])
         if fname:
-            with open(fname,"r") as f:
-                data = json.load(f)
-                self.tasks = []
-                for t in data:
-                    t["due"] = datetime.strptime(t["due"], "%Y-%m-%d") if t["due"] else None
-                    self.tasks.append(t)
-            self.update_view()
-            self.update_stats()
+            if self.journal:
+                self.journal.close()
+                self.journal = None
+            # With SQLite the database is the durable copy, so Load imports into it instead of replacing it
+            if not isinstance(self.index, SqliteTaskStore):
+                self.index.clear()
+                self.reminders.rebuild()
+            self.top = 0
+            self._load_dirty = False
+            self._loading = (fname, read_snapshot(fname), True)
+            self.load_next_chunk()
+
+    def restore_autosave(self):
+        # Pick up where the last session left off; the autosave file itself is never journaled
+        self._load_dirty = False
+        self._loading = (AUTOSAVE_FILE, read_snapshot(AUTOSAVE_FILE), False)
+        self.load_next_chunk()
+
+    def load_next_chunk(self):
+        # One batch per event-loop turn: the first page shows while the rest is still loading
+        fname, batches, attach = self._loading
+        self._applying = True
+        try:
+            try:
+                self._loaded_seq, batch = next(batches)
+            except StopIteration:
+                self.finish_load(fname, attach)
+                return
+            self.index.add_many(batch)
+        finally:
+            self._applying = False
+        self.update_view()
+        self.update_stats()
+        self.root.after(1, self.load_next_chunk)
+
+    def finish_load(self, fname, attach=True):
+        self._loading = None
+        if self.autosaver and (attach or self._load_dirty):
+            self.autosaver.mark_dirty()
+        if isinstance(self.index, SqliteTaskStore):
+            self.index.flush()
+        elif attach and self._loaded_seq is not None:
+            # Only journaled files get a journal; old JSON arrays are plain imports
+            seq = replay_journal(fname + ".journal", self.index, self._loaded_seq)
+            self.journal = TaskJournal(fname, seq)
+            if seq > self._loaded_seq or self._load_dirty:
+                self.journal.compact(self.index.all())
+        self.update_view()
+        self.update_stats()
 
 if __name__ == "__main__":
+    # Optional argument: path to a SQLite task database
     root = tk.Tk()
-    app = TaskManagerApp(root)
+    app = TaskManagerApp(root, sys.argv[1] if len(sys.argv) > 1 else None)
     root.mainloop()
+    app.index.flush()
+    if app.journal:
+        app.journal.close()
+    if app.autosaver:
+        app.autosaver.stop()
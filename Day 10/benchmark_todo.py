@@ -0,0 +1,130 @@
+# Benchmarks for the Tk-free task model in todo_model.py.
+# Times each model operation at several list sizes, optionally saving results and comparing
+# them against an earlier run so regressions show up before they reach the app.
+#
+#   python benchmark_todo.py                       # 1k, 100k, 1M tasks, in-memory store
+#   python benchmark_todo.py --sizes 1000 100000 --backend sqlite
+#   python benchmark_todo.py --json base.json      # save results
+#   python benchmark_todo.py --compare base.json   # exit 1 if anything got >1.5x slower
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from todo_model import Task, TaskIndex, SqliteTaskStore, PRIORITIES
+
+WORDS = ["buy", "milk", "call", "mom", "write", "report", "fix", "bug", "garden", "email",
+         "review", "pull", "request", "book", "flight", "pay", "rent", "clean", "desk", "plan"]
+CATEGORIES = ["home", "work", "errands", "health", ""]
+FILTERS = ["All", "High", "Today", "Overdue", "Done", "Not done"]
+MUTATIONS = 1000  # edits/toggles/deletes timed per size
+
+def make_tasks(n, rng):
+    today = datetime.now().toordinal()
+    for _ in range(n):
+        yield Task(" ".join(rng.sample(WORDS, 3)), rng.random() < 0.3, rng.choice(PRIORITIES),
+                   today + rng.randint(-30, 30) if rng.random() < 0.6 else None, rng.choice(CATEGORIES))
+
+def timed(fn, repeat=1):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def bench(n, backend, workdir, seed=1):
+    rng = random.Random(seed)
+    tasks = list(make_tasks(n, rng))
+    if backend == "sqlite":
+        db = os.path.join(workdir, f"bench_{n}.db")
+        if os.path.exists(db):
+            os.remove(db)
+        model = SqliteTaskStore(db, batch_size=10000)
+    else:
+        model = TaskIndex()
+    now = datetime.now()
+    results = {}
+
+    def add_all():
+        for t in tasks:
+            model.add(t)
+        model.flush()
+    results["add"] = timed(add_all)
+
+    ids = [t.id for t in tasks]
+    sample = rng.sample(ids, min(MUTATIONS, n))
+    for f in FILTERS:
+        results[f"filter:{f}"] = timed(lambda: model.filtered(f, "", now), repeat=3)
+    results["search:short"] = timed(lambda: model.filtered("All", "mi", now), repeat=3)
+    results["search:substring"] = timed(lambda: model.filtered("All", "port", now), repeat=3)
+    results["search:phrase"] = timed(lambda: model.filtered("All", "ix bug", now), repeat=3)
+    results["stats"] = timed(lambda: model.stats(now), repeat=3)
+
+    def edit():
+        for tid in sample:
+            model.update(tid, text=" ".join(rng.sample(WORDS, 3)), priority=rng.choice(PRIORITIES))
+        model.flush()
+    results[f"edit x{len(sample)}"] = timed(edit)
+
+    def toggle():
+        for tid in sample:
+            model.toggle(tid)
+        model.flush()
+    results[f"toggle x{len(sample)}"] = timed(toggle)
+
+    path = os.path.join(workdir, f"bench_{n}.ndjson")
+    results["save"] = timed(lambda: model.save(path))
+
+    def delete():
+        for tid in sample:
+            model.discard(tid)
+        model.flush()
+    results[f"delete x{len(sample)}"] = timed(delete)
+
+    results["load"] = timed(lambda: model.load(path))
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the to-do task model.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--backend", choices=["memory", "sqlite"], default="memory")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="baseline results file from an earlier --json run")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="slowdown factor that counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in args.sizes:
+            print(f"\n== {n:,} tasks ({args.backend}) ==")
+            results[str(n)] = bench(n, args.backend, workdir)
+            for op, secs in results[str(n)].items():
+                print(f"{op:<20} {secs * 1000:10.2f} ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"backend": args.backend, "results": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = []
+        for n, ops in results.items():
+            for op, secs in ops.items():
+                old = baseline.get(n, {}).get(op)
+                # Ignore sub-millisecond timings, they are mostly noise
+                if old and secs > 0.001 and secs > old * args.tolerance:
+                    regressions.append(f"{n} {op}: {old * 1000:.2f} ms -> {secs * 1000:.2f} ms")
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            return 1
+        print("\nNo regressions against", args.compare)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,820 @@
+# Tk-free task model for the Day 10 to-do app: task records, in-memory and SQLite stores,
+# NDJSON snapshot/journal persistence, background autosave and due-date reminders.
+# Import it directly (`from todo_model import TaskIndex`) to script or benchmark the model.
+from datetime import datetime, date
+from bisect import bisect_left, insort
+from functools import lru_cache
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import heapq
+from itertools import chain
+
+PRIORITIES = ("High", "Medium", "Low")
+LOAD_CHUNK = 5000  # tasks read per batch while loading
+AUTOSAVE_FILE = "tasks.autosave.ndjson"
+AUTOSAVE_DELAY = 1.0  # seconds of quiet before a burst of edits is written
+
+# Compact task record: no per-instance dict, interned priority/category strings,
+# due date stored as a date ordinal (int) instead of a datetime.
+class Task:
+    __slots__ = ("id", "text", "done", "priority", "due", "category")
+
+    def __init__(self, text, done=False, priority="Medium", due=None, category="", id=None):
+        self.id = id
+        self.text = text
+        self.done = done
+        self.priority = sys.intern(priority)
+        self.due = due
+        self.category = sys.intern(category)
+
+    def set(self, **changes):
+        for k, v in changes.items():
+            if k in ("priority", "category"):
+                v = sys.intern(v)
+            setattr(self, k, v)
+
+    def due_str(self):
+        return date.fromordinal(self.due).isoformat() if self.due else ""
+
+    def to_json(self):
+        return {"id": self.id, "text": self.text, "done": self.done, "priority": self.priority,
+                "due": self.due_str() or None, "category": self.category}
+
+    @classmethod
+    def from_json(cls, d):
+        due = iso_ordinal(d["due"]) if d.get("due") else None
+        return cls(d["text"], d.get("done", False), d.get("priority", "Medium"), due, d.get("category", ""), d.get("id"))
+
+# The due-date index needs every ordinal as soon as a task is added, so dates can't be deferred
+# past load. A list holds few distinct days, though, so each distinct string is parsed only once.
+@lru_cache(maxsize=4096)
+def iso_ordinal(text):
+    return date.fromisoformat(text).toordinal()
+
+def parse_due(due_str):
+    # "YYYY-MM-DD" from a dialog -> date ordinal, None if blank or invalid
+    try:
+        return datetime.strptime(due_str, "%Y-%m-%d").toordinal() if due_str else None
+    except ValueError:
+        return None
+
+def search_text(task):
+    return f'{task.text}\n{task.category}'.lower()
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def matches_filter(task, f, q, now):
+    # Whether one task belongs in filtered(f, q, now), to patch a view after a single change
+    today = now.toordinal()
+    if f in PRIORITIES:
+        ok = task.priority == f
+    elif f in ("Done", "Not done"):
+        ok = bool(task.done) == (f == "Done")
+    elif f == "Today":
+        ok = task.due == today
+    elif f == "Overdue":
+        ok = bool(task.due) and not task.done and task.due <= today
+    else:
+        ok = True
+    return ok and (not q or q in search_text(task))
+
+# Operations shared by both stores, written against get/update/add/all/clear/flush
+class TaskModelOps:
+    def toggle(self, tid):
+        return self.update(tid, done=not self.get(tid).done)
+
+    def save(self, path):
+        # Atomic NDJSON snapshot; returns bytes written
+        return write_snapshot(path, self.all(), 0)
+
+    def add_many(self, tasks):
+        return [self.add(t) for t in tasks]
+
+    def load(self, path):
+        # Replaces the contents with a snapshot (plus its journal, if any); returns the task count
+        self.clear()
+        seq = None
+        count = 0
+        for seq, batch in read_snapshot(path):
+            self.add_many(batch)
+            count += len(batch)
+        if seq is not None:
+            replay_journal(path + ".journal", self, seq)
+        self.flush()
+        return count
+
+# Ascending task ids split into chunks of at most 2 * CHUNK, so a delete or an out-of-order
+# insert shifts one short chunk instead of the whole list; iterating yields ids in list order.
+class IdList:
+    __slots__ = ("chunks", "maxes", "size")
+    CHUNK = 1000
+
+    def __init__(self, ids=()):
+        ids = list(ids)  # must already be ascending
+        self.chunks = [ids[i:i + self.CHUNK] for i in range(0, len(ids), self.CHUNK)]
+        self.maxes = [c[-1] for c in self.chunks]
+        self.size = len(ids)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return chain.from_iterable(self.chunks)
+
+    def add(self, tid):
+        # New tasks get the largest id, so this is usually an append to the last chunk
+        self.size += 1
+        if not self.maxes or tid > self.maxes[-1]:
+            if not self.chunks or len(self.chunks[-1]) >= self.CHUNK:
+                self.chunks.append([])
+                self.maxes.append(tid)
+            self.chunks[-1].append(tid)
+            self.maxes[-1] = tid
+            return
+        i = bisect_left(self.maxes, tid)
+        chunk = self.chunks[i]
+        insort(chunk, tid)
+        if len(chunk) > 2 * self.CHUNK:
+            self.chunks[i:i + 1] = [chunk[:self.CHUNK], chunk[self.CHUNK:]]
+            self.maxes.insert(i, chunk[self.CHUNK - 1])
+
+    def discard(self, tid):
+        i = bisect_left(self.maxes, tid)
+        if i == len(self.maxes):
+            return
+        chunk = self.chunks[i]
+        j = bisect_left(chunk, tid)
+        if j == len(chunk) or chunk[j] != tid:
+            return
+        del chunk[j]
+        self.size -= 1
+        if not chunk:
+            del self.chunks[i], self.maxes[i]
+        else:
+            self.maxes[i] = chunk[-1]
+
+# Secondary indexes over the task list so each filter only touches the tasks it returns.
+# Every task carries a stable integer id; ids grow with insertion, so sorting by id keeps list order.
+class TaskIndex(TaskModelOps):
+    def __init__(self):
+        self.listeners = []  # called as listener(op, id, payload) after each mutation
+        self.clear()
+
+    def clear(self):
+        self.tasks = {}  # id -> task, in insertion order
+        self.next_id = 1
+        # Buckets are IdLists, already in list order, so filters need no sort
+        self.by_priority = {p: IdList() for p in PRIORITIES}
+        self.by_done = {True: IdList(), False: IdList()}
+        # Due dates are day ordinals with few distinct values: one bucket per day plus a sorted
+        # list of the distinct days, so range queries bisect the days instead of scanning tasks
+        self.by_day = {}  # due ordinal -> IdList
+        self.days = []
+        self.open_by_day = {}  # same for not-done tasks, for overdue
+        self.open_days = []
+        # Not-done ids due on or before self.today, kept up to date by link/unlink and
+        # recomputed only when the day changes, so the Overdue filter is a plain copy
+        self.today = None
+        self.overdue = IdList()
+        self.by_gram = {}  # trigram of lowercased text/category -> set of ids
+
+    def add(self, task):
+        tid = task.id
+        if not isinstance(tid, int) or tid < self.next_id:
+            tid = task.id = self.next_id
+        self.next_id = tid + 1
+        self.tasks[tid] = task
+        self._link(task, tid)
+        self._notify("add", tid, task)
+        return tid
+
+    def add_many(self, tasks):
+        # Bulk insert for loading: like add() per task, but new due days are sorted once at the end
+        ids = []
+        for task in tasks:
+            tid = task.id
+            if not isinstance(tid, int) or tid < self.next_id:
+                tid = task.id = self.next_id
+            self.next_id = tid + 1
+            self.tasks[tid] = task
+            self._link(task, tid, sort_days=False)
+            ids.append(tid)
+        self.days.sort()
+        self.open_days.sort()
+        for tid in ids:
+            self._notify("add", tid, self.tasks[tid])
+        return ids
+
+    def discard(self, tid):
+        task = self.tasks.pop(tid)
+        self._unlink(task, tid)
+        self._notify("delete", tid, None)
+        return task
+
+    def update(self, tid, **changes):
+        # Edits replace the Task instead of changing it, so a list of tasks taken earlier stays
+        # a consistent snapshot while another thread writes it out
+        old = self.tasks[tid]
+        task = self.tasks[tid] = Task(old.text, old.done, old.priority, old.due, old.category, tid)
+        task.set(**changes)
+        self._relink(old, task, tid)
+        self._notify("update", tid, changes)
+        return task
+
+    def _notify(self, op, tid, payload):
+        for listener in self.listeners:
+            listener(op, tid, payload)
+
+    def get(self, tid):
+        return self.tasks.get(tid)
+
+    def all(self):
+        return self.tasks.values()
+
+    def flush(self):
+        pass
+
+    def filtered(self, f, q, now):
+        ids = self.query(f, now)
+        if not q:
+            return ids
+        hits = self.search(q)
+        if hits is None:
+            return [tid for tid in ids if q in search_text(self.tasks[tid])]
+        return [tid for tid in ids if tid in hits]
+
+    @staticmethod
+    def _day_add(buckets, days, day, tid, sort_days=True):
+        bucket = buckets.get(day)
+        if bucket is None:
+            bucket = buckets[day] = IdList()
+            if sort_days:
+                insort(days, day)
+            else:
+                days.append(day)
+        bucket.add(tid)
+
+    @staticmethod
+    def _day_discard(buckets, days, day, tid):
+        bucket = buckets[day]
+        bucket.discard(tid)
+        if not bucket:
+            del buckets[day]
+            del days[bisect_left(days, day)]
+
+    def _is_overdue(self, task):
+        return bool(task.due) and not task.done and self.today is not None and task.due <= self.today
+
+    def _link_due(self, task, tid, sort_days=True):
+        if task.due:
+            self._day_add(self.by_day, self.days, task.due, tid, sort_days)
+            if not task.done:
+                self._day_add(self.open_by_day, self.open_days, task.due, tid, sort_days)
+                if self._is_overdue(task):
+                    self.overdue.add(tid)
+
+    def _unlink_due(self, task, tid):
+        if task.due:
+            self._day_discard(self.by_day, self.days, task.due, tid)
+            if not task.done:
+                self._day_discard(self.open_by_day, self.open_days, task.due, tid)
+                if self._is_overdue(task):
+                    self.overdue.discard(tid)
+
+    def _link_grams(self, grams, tid):
+        for g in grams:
+            self.by_gram.setdefault(g, set()).add(tid)
+
+    def _unlink_grams(self, grams, tid):
+        for g in grams:
+            posting = self.by_gram.get(g)
+            if posting is not None:
+                posting.discard(tid)
+                if not posting:
+                    del self.by_gram[g]
+
+    def _priority_ids(self, priority):
+        ids = self.by_priority.get(priority)
+        if ids is None:
+            ids = self.by_priority[priority] = IdList()
+        return ids
+
+    def _link(self, task, tid, sort_days=True):
+        self._priority_ids(task.priority).add(tid)
+        self.by_done[bool(task.done)].add(tid)
+        self._link_due(task, tid, sort_days)
+        self._link_grams(trigrams(search_text(task)), tid)
+
+    def _unlink(self, task, tid):
+        self.by_priority[task.priority].discard(tid)
+        self.by_done[bool(task.done)].discard(tid)
+        self._unlink_due(task, tid)
+        self._unlink_grams(trigrams(search_text(task)), tid)
+
+    def _relink(self, old, task, tid):
+        # Like _unlink(old) + _link(task), but only touches the buckets whose key changed,
+        # so an edit doesn't shift the large done/priority lists it stays in
+        if old.priority != task.priority:
+            self.by_priority[old.priority].discard(tid)
+            self._priority_ids(task.priority).add(tid)
+        if bool(old.done) != bool(task.done):
+            self.by_done[bool(old.done)].discard(tid)
+            self.by_done[bool(task.done)].add(tid)
+        if old.due != task.due or bool(old.done) != bool(task.done):
+            self._unlink_due(old, tid)
+            self._link_due(task, tid)
+        old_text, new_text = search_text(old), search_text(task)
+        if old_text != new_text:
+            old_grams, new_grams = trigrams(old_text), trigrams(new_text)
+            self._unlink_grams(old_grams - new_grams, tid)
+            self._link_grams(new_grams - old_grams, tid)
+
+    def _roll_overdue(self, today):
+        # Called with each query's date; only does work when the day has changed (midnight)
+        if today == self.today:
+            return
+        self.today = today
+        hi = bisect_left(self.open_days, today + 1)
+        buckets = (self.open_by_day[day] for day in self.open_days[:hi])
+        self.overdue = IdList(sorted(chain.from_iterable(buckets)))
+
+    def search(self, q):
+        # Ids whose text or category contains q; None if q is too short for the trigram index
+        grams = trigrams(q)
+        if not grams:
+            return None
+        postings = sorted((self.by_gram.get(g, set()) for g in grams), key=len)
+        hits = set(postings[0])
+        for p in postings[1:]:
+            hits &= p
+            if not hits:
+                break
+        # Trigrams can match out of order, so confirm the actual substring
+        return {tid for tid in hits if q in search_text(self.tasks[tid])}
+
+    def due_between(self, start, end, open_only=False):
+        # Ids with start <= due < end (None means unbounded) in id order, merged from the
+        # already sorted day buckets in range
+        buckets, days = (self.open_by_day, self.open_days) if open_only else (self.by_day, self.days)
+        lo = bisect_left(days, start) if start else 0
+        hi = bisect_left(days, end) if end else len(days)
+        if hi - lo == 1:
+            return list(buckets[days[lo]])
+        return list(heapq.merge(*(buckets[day] for day in days[lo:hi])))
+
+    def stats(self, now):
+        # (done, not done, overdue, due today) from bucket sizes, no scan over tasks.
+        # Due dates are whole days at midnight, so anything due today or earlier is already past due;
+        # the overdue list is maintained on every change and only rebuilt when the day rolls over.
+        today = now.toordinal()
+        self._roll_overdue(today)
+        return len(self.by_done[True]), len(self.by_done[False]), len(self.overdue), len(self.by_day.get(today, ()))
+
+    def query(self, f, now):
+        # Ids matching the filter, in list order
+        if f in PRIORITIES:
+            return list(self.by_priority[f])
+        if f == "Done":
+            return list(self.by_done[True])
+        if f == "Not done":
+            return list(self.by_done[False])
+        if f == "Today":
+            return self.due_between(now.toordinal(), now.toordinal() + 1)
+        if f == "Overdue":
+            self._roll_overdue(now.toordinal())
+            return list(self.overdue)
+        return list(self.tasks)
+
+# Same interface as TaskIndex, backed by SQLite: filters, search and stats become indexed queries.
+# Writes go into an open transaction that is committed every batch_size changes or on flush().
+class SqliteTaskStore(TaskModelOps):
+    FILTERS = {
+        "High": ("priority = ?", ("High",)),
+        "Medium": ("priority = ?", ("Medium",)),
+        "Low": ("priority = ?", ("Low",)),
+        "Done": ("done = 1", ()),
+        "Not done": ("done = 0", ()),
+    }
+
+    def __init__(self, path, batch_size=500):
+        self.conn = sqlite3.connect(path)
+        self.batch_size = batch_size
+        self.pending = 0
+        self.listeners = []
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY, text TEXT NOT NULL, done INTEGER NOT NULL DEFAULT 0,
+                priority TEXT NOT NULL, due INTEGER, category TEXT NOT NULL DEFAULT '');
+            CREATE INDEX IF NOT EXISTS tasks_priority ON tasks (priority);
+            CREATE INDEX IF NOT EXISTS tasks_done ON tasks (done);
+            CREATE INDEX IF NOT EXISTS tasks_due ON tasks (due);
+            CREATE INDEX IF NOT EXISTS tasks_category ON tasks (category);
+            CREATE INDEX IF NOT EXISTS tasks_open_due ON tasks (due) WHERE done = 0;
+        """)
+        try:
+            self.conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+                    text, category, content='tasks', content_rowid='id', tokenize='trigram');
+                CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+                    INSERT INTO tasks_fts (rowid, text, category) VALUES (new.id, new.text, new.category);
+                END;
+                CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+                    INSERT INTO tasks_fts (tasks_fts, rowid, text, category) VALUES ('delete', old.id, old.text, old.category);
+                END;
+                CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF text, category ON tasks BEGIN
+                    INSERT INTO tasks_fts (tasks_fts, rowid, text, category) VALUES ('delete', old.id, old.text, old.category);
+                    INSERT INTO tasks_fts (rowid, text, category) VALUES (new.id, new.text, new.category);
+                END;
+            """)
+            self.fts = True
+        except sqlite3.OperationalError:
+            self.fts = False  # SQLite without the FTS5 trigram tokenizer: search falls back to LIKE
+        self.conn.commit()
+
+    @staticmethod
+    def _task(row):
+        return Task(row[1], bool(row[2]), row[3], row[4], row[5], row[0]) if row else None
+
+    def get(self, tid):
+        return self._task(self.conn.execute("SELECT * FROM tasks WHERE id = ?", (tid,)).fetchone())
+
+    def all(self):
+        cur = self.conn.execute("SELECT * FROM tasks ORDER BY id")
+        while True:
+            rows = cur.fetchmany(1000)
+            if not rows:
+                break
+            for row in rows:
+                yield self._task(row)
+
+    def clear(self):
+        self.conn.execute("DELETE FROM tasks")
+        self._wrote(force=True)
+
+    def add(self, task):
+        cur = self.conn.execute(
+            "INSERT INTO tasks (id, text, done, priority, due, category) VALUES (?, ?, ?, ?, ?, ?)",
+            (task.id if isinstance(task.id, int) and self.get(task.id) is None else None,
+             task.text, int(task.done), task.priority, task.due, task.category))
+        task.id = cur.lastrowid
+        self._wrote()
+        self._notify("add", task.id, task)
+        return task.id
+
+    def discard(self, tid):
+        task = self.get(tid)
+        self.conn.execute("DELETE FROM tasks WHERE id = ?", (tid,))
+        self._wrote()
+        self._notify("delete", tid, None)
+        return task
+
+    def update(self, tid, **changes):
+        cols = ", ".join(f"{k} = ?" for k in changes)
+        vals = [int(v) if k == "done" else v for k, v in changes.items()]
+        self.conn.execute(f"UPDATE tasks SET {cols} WHERE id = ?", vals + [tid])
+        self._wrote()
+        self._notify("update", tid, changes)
+        return self.get(tid)
+
+    def _notify(self, op, tid, payload):
+        for listener in self.listeners:
+            listener(op, tid, payload)
+
+    def _wrote(self, force=False):
+        self.pending += 1
+        if force or self.pending >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.conn.commit()
+            self.pending = 0
+
+    def _where(self, f, q, now):
+        clauses, args = [], []
+        today = now.toordinal()
+        if f in self.FILTERS:
+            clause, a = self.FILTERS[f]
+            clauses.append(clause)
+            args.extend(a)
+        elif f == "Today":
+            clauses.append("due = ?")
+            args.append(today)
+        elif f == "Overdue":
+            clauses.append("done = 0 AND due <= ?")
+            args.append(today)
+        if q:
+            if self.fts and len(q) >= 3:
+                clauses.append("id IN (SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ?)")
+                args.append('"' + q.replace('"', '""') + '"')
+            else:
+                clauses.append("(lower(text) LIKE ? ESCAPE '\\' OR lower(category) LIKE ? ESCAPE '\\')")
+                pattern = "%" + q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                args.extend([pattern, pattern])
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+    def filtered(self, f, q, now):
+        where, args = self._where(f, q, now)
+        return [r[0] for r in self.conn.execute(f"SELECT id FROM tasks{where} ORDER BY id", args)]
+
+    def stats(self, now):
+        today = now.toordinal()
+        total, done = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(done), 0) FROM tasks").fetchone()
+        overdue = self.conn.execute("SELECT COUNT(*) FROM tasks WHERE done = 0 AND due <= ?", (today,)).fetchone()[0]
+        due_today = self.conn.execute("SELECT COUNT(*) FROM tasks WHERE due = ?", (today,)).fetchone()[0]
+        return done, total - done, overdue, due_today
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+# Persistence: an NDJSON snapshot (header line, then one task per line) plus an append-only
+# journal of mutations next to it. Journal lines carry a sequence number and the snapshot
+# header records the last one it includes, so replay after a crash never applies an op twice.
+def write_snapshot(path, tasks, seq):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(json.dumps({"format": "tasks-ndjson", "seq": seq}) + "\n")
+        for t in tasks:
+            f.write(json.dumps(t.to_json()) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+        size = f.tell()
+    os.replace(tmp, path)
+    return size
+
+def read_snapshot(path, chunk=LOAD_CHUNK):
+    # Yields (seq, [Task, ...]) batches; seq is None for the old single JSON array format
+    with open(path, "r") as f:
+        first = f.readline()
+        if first.lstrip().startswith("["):
+            f.seek(0)
+            yield None, [Task.from_json(d) for d in json.load(f)]
+            return
+        seq = json.loads(first).get("seq", 0) if first.strip() else 0
+        batch = []
+        for line in f:
+            if line.strip():
+                batch.append(Task.from_json(json.loads(line)))
+            if len(batch) >= chunk:
+                yield seq, batch
+                batch = []
+        yield seq, batch
+
+def _changes_to_json(changes):
+    out = dict(changes)
+    if "due" in out:
+        out["due"] = date.fromordinal(out["due"]).isoformat() if out["due"] else None
+    return out
+
+def _changes_from_json(changes):
+    if "due" in changes:
+        changes["due"] = iso_ordinal(changes["due"]) if changes["due"] else None
+    return changes
+
+def replay_journal(path, index, after_seq):
+    # Applies journal ops newer than the snapshot; returns the last seq seen.
+    # path + ".old" holds the ops of a background compaction that had not finished yet.
+    seq = after_seq
+    for p in (path + ".old", path):
+        if not os.path.exists(p):
+            continue
+        with open(p, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # torn final line from a crash mid-append
+                if entry["seq"] <= seq:
+                    continue
+                op, tid = entry["op"], entry.get("id")
+                if op == "add":
+                    index.add(Task.from_json(entry["task"]))
+                elif op == "update" and index.get(tid) is not None:
+                    index.update(tid, **_changes_from_json(entry["changes"]))
+                elif op == "delete" and index.get(tid) is not None:
+                    index.discard(tid)
+                seq = entry["seq"]
+    return seq
+
+class TaskJournal:
+    def __init__(self, path, seq=0, compact_every=1000):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.old_path = self.journal_path + ".old"
+        self.seq = seq
+        self.compact_every = compact_every
+        self.pending = 0
+        self.last_error = None
+        self.file = open(self.journal_path, "a")
+        self._compactor = None  # thread writing a snapshot for compact_in_background()
+
+    def record(self, op, tid, payload):
+        self.seq += 1
+        entry = {"seq": self.seq, "op": op, "id": tid}
+        if op == "add":
+            entry["task"] = payload.to_json()
+        elif op == "update":
+            entry["changes"] = _changes_to_json(payload)
+        self.file.write(json.dumps(entry) + "\n")
+        self.file.flush()
+        self.pending += 1
+
+    def compact(self, tasks):
+        # Fold the journal into a fresh snapshot, then start an empty journal
+        self.wait()
+        write_snapshot(self.path, tasks, self.seq)
+        self.file.close()
+        self.file = open(self.journal_path, "w")
+        self.pending = 0
+        if os.path.exists(self.old_path):
+            os.remove(self.old_path)
+
+    def compact_in_background(self, tasks):
+        # Like compact(), but the snapshot is written on a thread. `tasks` is a list taken on the
+        # calling thread, and TaskIndex.update() replaces tasks rather than editing them, so it
+        # stays the state at self.seq. The ops it covers move to the .old file, which replay
+        # reads first, until the snapshot is in place. Returns False if one is still running.
+        if self._compactor is not None and self._compactor.is_alive():
+            return False
+        self.file.close()
+        if os.path.exists(self.old_path):
+            # Left over from a compaction that failed: keep its ops ahead of the newer ones
+            with open(self.old_path, "a") as old, open(self.journal_path, "r") as cur:
+                old.write(cur.read())
+            os.remove(self.journal_path)
+        else:
+            os.replace(self.journal_path, self.old_path)
+        self.file = open(self.journal_path, "a")
+        self.pending = 0
+        self._compactor = threading.Thread(target=self._write_snapshot, args=(tasks, self.seq))
+        self._compactor.start()
+        return True
+
+    def _write_snapshot(self, tasks, seq):
+        try:
+            write_snapshot(self.path, tasks, seq)
+            os.remove(self.old_path)
+        except OSError as e:
+            self.last_error = e
+
+    def wait(self):
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+
+    def close(self):
+        self.wait()
+        self.file.close()
+
+# Writes snapshots from a background thread. mark_dirty() is cheap and can be called on every
+# mutation; the thread waits until edits pause for `delay` seconds and then writes once.
+# The Task objects are serialised on this thread while the Tk thread may still be editing them,
+# so each mark_dirty() bumps a generation counter: a save that overlapped an edit leaves the
+# counter ahead of what was written, and the next pass (or stop()) writes again.
+class Autosaver:
+    def __init__(self, path, get_tasks, delay=AUTOSAVE_DELAY):
+        self.path = path
+        self.get_tasks = get_tasks  # must return a list; list(dict.values()) is taken atomically
+        self.generation = 0  # bumped by every mark_dirty()
+        self.saved_generation = 0  # generation the last successful save started from
+        self.delay = delay
+        self.saves = 0
+        self.last_seconds = 0.0
+        self.total_seconds = 0.0
+        self.last_bytes = 0
+        self.total_bytes = 0
+        self.last_error = None
+        self._last_mark = 0.0
+        self._dirty = threading.Event()
+        self._stopping = False
+        self._lock = threading.Lock()  # one write at a time (thread vs final flush)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def mark_dirty(self):
+        self._last_mark = time.monotonic()
+        self.generation += 1
+        self._dirty.set()
+
+    def _run(self):
+        while not self._stopping:
+            self._dirty.wait()
+            if self._stopping:
+                break
+            # Coalesce: keep waiting while edits are still arriving
+            while time.monotonic() - self._last_mark < self.delay and not self._stopping:
+                time.sleep(self.delay - (time.monotonic() - self._last_mark))
+            self._dirty.clear()
+            if self.save() and self.generation != self.saved_generation:
+                self._dirty.set()  # edited while the snapshot was being written: go round again
+
+    def save(self):
+        with self._lock:
+            generation = self.generation
+            start = time.perf_counter()
+            try:
+                size = write_snapshot(self.path, self.get_tasks(), 0)
+            except OSError as e:
+                self.last_error = e
+                return False
+            self.last_seconds = time.perf_counter() - start
+            self.total_seconds += self.last_seconds
+            self.last_bytes = size
+            self.total_bytes += size
+            self.saves += 1
+            self.saved_generation = generation
+            return True
+
+    def metrics(self):
+        return {"saves": self.saves, "last_seconds": self.last_seconds, "total_seconds": self.total_seconds,
+                "avg_seconds": self.total_seconds / self.saves if self.saves else 0.0,
+                "last_bytes": self.last_bytes, "total_bytes": self.total_bytes, "last_error": self.last_error}
+
+    def stop(self, flush=True):
+        self._stopping = True
+        self._dirty.set()
+        self._thread.join()
+        if flush and self.generation != self.saved_generation:
+            self.save()
+
+# Min-heap of (due ordinal, id) for open tasks with a future due date, driving a single
+# root.after timer. `scheduled` maps each id to the due date it is currently waiting for;
+# heap entries are never removed in place, and ones that no longer match it (task deleted,
+# done, rescheduled or pushed twice) are skipped when they reach the top.
+class ReminderScheduler:
+    def __init__(self, root, index, on_due):
+        self.root = root
+        self.index = index
+        self.on_due = on_due  # called with the list of ids that just came due
+        self.heap = []
+        self.scheduled = {}  # id -> due ordinal of its live heap entry
+        self.job = None
+        self.armed_for = None
+        index.listeners.append(self.on_change)
+
+    def on_change(self, op, tid, payload):
+        if op == "add":
+            self.push(payload)
+        elif op == "update" and ("due" in payload or "done" in payload):
+            self.push(self.index.get(tid))
+        elif op == "delete":
+            self.scheduled.pop(tid, None)
+
+    def push(self, task):
+        if task is None:
+            return
+        if task.done or not task.due or task.due <= datetime.now().toordinal():
+            self.scheduled.pop(task.id, None)
+            return
+        if self.scheduled.get(task.id) == task.due:
+            return  # already waiting for this date (e.g. an edit that kept the due date)
+        self.scheduled[task.id] = task.due
+        heapq.heappush(self.heap, (task.due, task.id))
+        if self.armed_for is None or task.due < self.armed_for:
+            self.arm()
+
+    def rebuild(self):
+        today = datetime.now().toordinal()
+        self.heap = [(t.due, t.id) for t in self.index.all() if t.due and not t.done and t.due > today]
+        heapq.heapify(self.heap)
+        self.scheduled = {tid: due for due, tid in self.heap}
+        self.arm()
+
+    def arm(self):
+        # Next wake-up: the earliest reminder, or midnight so the day-based counters roll over
+        now = datetime.now()
+        wake = now.toordinal() + 1
+        if self.heap:
+            wake = min(wake, self.heap[0][0])
+        if self.job:
+            self.root.after_cancel(self.job)
+        self.armed_for = wake
+        delay = (datetime.combine(date.fromordinal(wake), datetime.min.time()) - now).total_seconds()
+        self.job = self.root.after(max(1, int(delay * 1000) + 1), self.fire)
+
+    def fire(self):
+        self.job = None
+        self.armed_for = None
+        today = datetime.now().toordinal()
+        due = []
+        while self.heap and self.heap[0][0] <= today:
+            when, tid = heapq.heappop(self.heap)
+            if self.scheduled.get(tid) != when:
+                continue
+            del self.scheduled[tid]
+            task = self.index.get(tid)
+            if task is not None and not task.done and task.due == when:
+                due.append(tid)
+        self.arm()
+        self.on_due(due)
+
+    def cancel(self):
+        if self.job:
+            self.root.after_cancel(self.job)
+            self.job = None
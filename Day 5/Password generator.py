@@ -1,34 +1,277 @@
 import tkinter as tk
-import random
+from tkinter import messagebox
+import os
 import string
+import sys
+import argparse
+import functools
+import hashlib
+import heapq
+import math
+import mmap
+import re
+import struct
+import tempfile
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:  # optional: the pure-Python path below uses bytes.translate instead
+    np = None
+
+SYMBOLS = "@#$%!?^&*()_-~"
+
+# For password scoring. Each character is mapped to a class bit (lower, upper, digit, symbol,
+# anything else); entropy is length * log2(size of the pool the classes span).
+CLASS_POOLS = [(string.ascii_lowercase, 26), (string.ascii_uppercase, 26), (string.digits, 10), (SYMBOLS, len(SYMBOLS))]
+OTHER_POOL = len(set(string.punctuation + " ") - set(SYMBOLS))  # remaining ASCII punctuation plus space
+POOL_SIZE = [sum(size for i, (_, size) in enumerate(CLASS_POOLS) if mask >> i & 1) + (OTHER_POOL if mask & 16 else 0)
+             for mask in range(32)]
+CLASS_MARKS = "luds"
+MARK_TABLE = str.maketrans({c: CLASS_MARKS[i] for i, (chars, _) in enumerate(CLASS_POOLS) for c in chars})
+STRIP_MARKS = str.maketrans("", "", CLASS_MARKS)
+BYTE_BITS = [16] * 256
+for i, (chars, _) in enumerate(CLASS_POOLS):
+    for ch in chars.encode("ascii"):
+        BYTE_BITS[ch] = 1 << i
+STRENGTH = [  # (min length, min classes, label, colour), first match wins
+    (16, 4, "Excellent", "#88cc44"),
+    (12, 3, "Strong", "#33aaff"),
+    (8, 2, "Medium", "#ffaa22"),
+    (0, 0, "Weak", "#ee4433"),
+]
+
+def class_masks(passwords):
+    # Class bitmask per password. Equal-length ASCII batches (what the generator produces) go through
+    # numpy as one (n, length) byte array; anything else uses a str.translate pass per password.
+    if np is not None and len(passwords) > 1:
+        length = len(passwords[0])
+        blob = "".join(passwords)
+        # Every row must have the same length; a matching total alone lets rows spill into each other
+        if length and blob.isascii() and all(len(pw) == length for pw in passwords):
+            chars = np.frombuffer(blob.encode("ascii"), dtype=np.uint8).reshape(len(passwords), length)
+            return np.bitwise_or.reduce(np.array(BYTE_BITS, dtype=np.uint8)[chars], axis=1).tolist()
+    masks = []
+    for pw in passwords:
+        marks = pw.translate(MARK_TABLE)
+        mask = 16 if marks.translate(STRIP_MARKS) else 0
+        for i, m in enumerate(CLASS_MARKS):
+            if m in marks:
+                mask |= 1 << i
+        masks.append(mask)
+    return masks
+
+def score_batch(passwords):
+    # [(label, colour, entropy bits)] for every password in one go
+    results = []
+    for pw, mask in zip(passwords, class_masks(passwords)):
+        length = len(pw)
+        types = bin(mask & 15).count("1")
+        entropy = length * math.log2(POOL_SIZE[mask]) if mask else 0.0
+        for min_len, min_types, label, color in STRENGTH:
+            if length >= min_len and types >= min_types:
+                break
+        results.append((label, color, entropy))
+    return results
 
-# For password scoring
 def score(password):
-    length = len(password)
-    types = sum([
-        any(c.islower() for c in password),
-        any(c.isupper() for c in password),
-        any(c.isdigit() for c in password),
-        any(c in "@#$%!?^&*()_-~" for c in password)
-    ])
-    entropy = length * (types * 2.5)
-    if length >= 16 and types == 4:
-        label, color = "Excellent", "#88cc44"
-    elif length >= 12 and types >= 3:
-        label, color = "Strong", "#33aaff"
-    elif length >= 8 and types >= 2:
-        label, color = "Medium", "#ffaa22"
-    else:
-        label, color = "Weak", "#ee4433"
-    return label, color, entropy
+    return score_batch([password])[0]
 
-# Secure password generator that ensures all types if selected
-def secure_password(length, lower, upper, digit, symbol, ambiguous):
+# Pattern-aware estimate (zxcvbn style): find dictionary words, keyboard walks, repeats, sequences and
+# dates, then take the cheapest way to cover the password with those matches plus brute-forced
+# characters. Bits = log2(guesses). The lookup tables are built lazily on first use and cached.
+COMMON_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "common_passwords.txt")
+COMMON_WORDS = """password 123456 qwerty letmein welcome admin monkey dragon football baseball iloveyou
+master sunshine princess shadow superman batman trustno1 login starwars hello freedom whatever
+charlie michael jordan jennifer hunter secret summer winter spring autumn love angel pass test
+computer internet cookie orange banana apple chocolate flower soccer hockey killer ninja pokemon
+access mustang thomas ginger buster pepper robert daniel matrix silver golden""".split()
+L33T = str.maketrans({"4": "a", "@": "a", "8": "b", "(": "c", "3": "e", "1": "i", "!": "i", "|": "l",
+                      "0": "o", "$": "s", "5": "s", "+": "t", "7": "t", "%": "x", "2": "z"})
+KEYBOARD_ROWS = ["`1234567890-=", "qwertyuiop[]\\", "asdfghjkl;'", "zxcvbnm,./"]
+SHIFTED_ROWS = ["~!@#$%^&*()_+", "QWERTYUIOP{}|", 'ASDFGHJKL:"', "ZXCVBNM<>?"]
+REF_YEAR = date.today().year  # years near this one are the likeliest guesses
+YEAR_RE = re.compile(r"19\d\d|20[0-4]\d")
+DMY_RE = re.compile(r"(\d{1,2})([-/. ]?)(\d{1,2})\2(\d{4}|\d{2})")
+YMD_RE = re.compile(r"(\d{4})([-/. ]?)(\d{1,2})\2(\d{1,2})")
+REPEAT_RE = re.compile(r"(.+?)\1+")
+PATTERN_STRENGTH = [  # (bits below, label, colour): roughly 10^3, 10^6, 10^8, 10^10 guesses
+    (10, "Very weak", "#ee4433"),
+    (20, "Weak", "#ee4433"),
+    (27, "Fair", "#ffaa22"),
+    (33, "Strong", "#33aaff"),
+    (float("inf"), "Excellent", "#88cc44"),
+]
+
+@functools.lru_cache(maxsize=None)
+def ranked_words():
+    # {word: rank} from the shipped list (most common first) plus the built-in words, and the
+    # set of all their prefixes. The prefix set is a flattened trie: a scan stops as soon as the
+    # substring is no longer the start of any word.
+    words = []
+    if os.path.exists(COMMON_FILE):
+        with open(COMMON_FILE, encoding="utf-8", errors="ignore") as f:
+            words = [w.strip().lower() for w in f if not w.startswith("#")]
+    ranks = {}
+    for w in words + COMMON_WORDS:
+        if len(w) >= 3:
+            ranks.setdefault(w, len(ranks) + 1)
+    prefixes = {w[:i] for w in ranks for i in range(1, len(w) + 1)}
+    return ranks, prefixes
+
+@functools.lru_cache(maxsize=None)
+def keyboard_graph():
+    # Key -> adjacent keys on a staggered QWERTY layout; shifted characters map to their key cap
+    pos, unshift = {}, {}
+    for r, (row, shifted) in enumerate(zip(KEYBOARD_ROWS, SHIFTED_ROWS)):
+        for c, (k, sk) in enumerate(zip(row, shifted)):
+            pos[k] = (r, c)
+            unshift[sk] = k
+    at = {p: k for k, p in pos.items()}
+    graph = {}
+    for k, (r, c) in pos.items():
+        near = [(r, c - 1), (r, c + 1), (r - 1, c), (r - 1, c + 1), (r + 1, c - 1), (r + 1, c)]
+        graph[k] = {at[p] for p in near if p in at}
+    degree = sum(len(v) for v in graph.values()) / len(graph)
+    return graph, unshift, degree
+
+def _caps_factor(token):
+    upper = sum(ch.isupper() for ch in token)
+    if not upper:
+        return 1
+    if upper == len(token) or (upper == 1 and token[0].isupper()):
+        return 2
+    return 2 ** upper
+
+def _word_matches(pw, matches):
+    ranks, prefixes = ranked_words()
+    n = len(pw)
+    lower = pw.lower()
+    variants = [(lower, False, 1), (lower[::-1], True, 2)]
+    unleet = lower.translate(L33T)
+    if unleet != lower:
+        variants.append((unleet, False, 2))
+    for source, reverse, mult in variants:
+        for i in range(n):
+            for j in range(i + 1, n + 1):
+                sub = source[i:j]
+                if sub not in prefixes:
+                    break
+                rank = ranks.get(sub)
+                if rank:
+                    a, b = (n - j, n - i) if reverse else (i, j)
+                    matches.append((a, b, rank * mult * _caps_factor(pw[a:b]), "dictionary", pw[a:b]))
+
+def _walk_matches(pw, matches):
+    graph, unshift, degree = keyboard_graph()
+    keys = [unshift.get(ch, ch) for ch in pw]
+    n = len(pw)
+    i = 0
+    while i < n:
+        j = i + 1
+        while j < n and keys[j] in graph.get(keys[j - 1], ()):
+            j += 1
+        if j - i >= 3:
+            shifted = any(ch in unshift for ch in pw[i:j])
+            matches.append((i, j, len(graph) * degree ** (j - i - 1) * (2 if shifted else 1), "keyboard", pw[i:j]))
+        i = j
+
+def _sequence_matches(pw, matches):
+    n = len(pw)
+    i = 0
+    while i < n - 2:
+        delta = ord(pw[i + 1]) - ord(pw[i])
+        j = i + 1
+        if 0 < abs(delta) <= 5:
+            while j + 1 < n and ord(pw[j + 1]) - ord(pw[j]) == delta:
+                j += 1
+        if j - i >= 2:
+            token = pw[i:j + 1]
+            base = 4 if token[0] in "aAzZ019" else 10 if token[0].isdigit() else 26
+            matches.append((i, j + 1, base * len(token) * (1 if delta > 0 else 2), "sequence", token))
+            i = j
+        else:
+            i += 1
+
+def _repeat_matches(pw, matches):
+    for m in REPEAT_RE.finditer(pw):
+        unit = m.group(1)
+        count = len(m.group(0)) // len(unit)
+        matches.append((m.start(), m.end(), 2 ** _min_bits(unit)[0] * count, "repeat", m.group(0)))
+
+def _year(text):
+    y = int(text)
+    if len(text) == 2:
+        y += 1900 if y > 50 else 2000
+    return y if 1900 <= y < 2050 else None
+
+def _add_date(i, j, m, year, matches):
+    if year:
+        matches.append((i, j, 365 * max(abs(year - REF_YEAR), 20) * (4 if m.group(2) else 1), "date", m.group()))
+
+def _date_matches(pw, matches):
+    for m in YEAR_RE.finditer(pw):
+        matches.append((m.start(), m.end(), max(abs(int(m.group()) - REF_YEAR), 20), "date", m.group()))
+    n = len(pw)
+    for i in range(n - 3):
+        if not pw[i].isdigit():
+            continue
+        for j in range(i + 4, min(n, i + 10) + 1):
+            m = DMY_RE.fullmatch(pw, i, j)
+            if m:
+                a, b = int(m.group(1)), int(m.group(3))
+                if (1 <= a <= 31 and 1 <= b <= 12) or (1 <= b <= 31 and 1 <= a <= 12):
+                    _add_date(i, j, m, _year(m.group(4)), matches)
+            m = YMD_RE.fullmatch(pw, i, j)
+            if m and 1 <= int(m.group(3)) <= 12 and 1 <= int(m.group(4)) <= 31:
+                _add_date(i, j, m, _year(m.group(1)), matches)
+
+def _min_bits(pw):
+    # Cheapest cover of pw by pattern matches and brute-forced characters (dynamic programming
+    # over end positions); returns (bits, [(kind, token), ...])
+    n = len(pw)
+    if not n:
+        return 0.0, []
+    matches = []
+    for find in (_word_matches, _walk_matches, _sequence_matches, _repeat_matches, _date_matches):
+        find(pw, matches)
+    by_end = {}
+    for m in matches:
+        by_end.setdefault(m[1], []).append(m)
+    brute = math.log2(POOL_SIZE[class_masks([pw])[0]] or 10)
+    best = [0.0] * (n + 1)
+    back = [None] * (n + 1)
+    for j in range(1, n + 1):
+        best[j] = best[j - 1] + brute
+        for m in by_end.get(j, ()):
+            cost = best[m[0]] + math.log2(max(m[2], 2))
+            if cost < best[j]:
+                best[j], back[j] = cost, m
+    patterns = []
+    j = n
+    while j > 0:
+        m = back[j]
+        if m is None:
+            j -= 1
+        else:
+            patterns.append((m[3], m[4]))
+            j = m[0]
+    return best[n], patterns[::-1]
+
+def estimate(password):
+    # (label, colour, bits, [(kind, token), ...]) for the weakest way an attacker could model it
+    bits, patterns = _min_bits(password)
+    for limit, label, color in PATTERN_STRENGTH:
+        if bits < limit:
+            break
+    return label, color, bits, patterns
+
+def build_charsets(lower, upper, digit, symbol, ambiguous):
     # Define allowed chars
     l = string.ascii_lowercase
     u = string.ascii_uppercase
     d = string.digits
-    s = "@#$%!?^&*()_-~"
+    s = SYMBOLS
     # Remove ambiguous chars if requested
     if ambiguous:
         l = ''.join(c for c in l if c not in "ilo")
@@ -39,19 +282,351 @@ def secure_password(length, lower, upper, digit, symbol, ambiguous):
     if upper: charsets.append(u)
     if digit: charsets.append(d)
     if symbol: charsets.append(s)
+    return charsets
+
+# Bulk generator on the OS CSPRNG. Random bytes are drawn in large buffers and mapped onto the
+# alphabet with rejection sampling (bytes >= the largest multiple of the alphabet size are dropped),
+# so every character is uniform. Passwords missing a selected class are rejected whole, which keeps
+# the result uniform over all valid passwords instead of biasing the "forced" positions.
+class PasswordEngine:
+    def __init__(self, charsets):
+        self.charsets = [cs for cs in charsets if cs]
+        self.alphabet = ''.join(self.charsets).encode("ascii")
+        m = len(self.alphabet)
+        self.limit = 256 - 256 % m if m else 0
+        # bytes.translate does the byte -> char mapping and the rejection in one C pass
+        self.table = bytes(self.alphabet[b % m] if b < self.limit else 0 for b in range(256)) if m else b""
+        self.reject = bytes(range(self.limit, 256))
+        self.class_sets = [frozenset(cs) for cs in self.charsets]
+        # Bit i set for characters of class i; a password is valid when its OR covers every class
+        self.class_bits = [0] * 256
+        for i, cs in enumerate(self.charsets):
+            for ch in cs.encode("ascii"):
+                self.class_bits[ch] |= 1 << i
+        self.all_bits = (1 << len(self.charsets)) - 1
+        if np is not None:
+            self.np_class_bits = np.array(self.class_bits, dtype=np.uint8)
+
+    def _random_chars(self, n):
+        # n uniformly random alphabet characters as bytes
+        out = b""
+        while len(out) < n:
+            need = n - len(out)
+            raw = os.urandom(need + need * (256 - self.limit) // self.limit + 64)
+            out += raw.translate(self.table, self.reject)
+        return out[:n]
+
+    def generate_block(self, length, count):
+        # `count` passwords as one newline-terminated bytes block (what bulk output wants)
+        if not self.alphabet or length < 1 or count < 1:
+            return b""
+        # Can't fit one of each class: fall back to plain uniform characters
+        enforce = length >= len(self.charsets) > 1
+        if np is None:
+            rows = []
+            while len(rows) < count:
+                chars = self._random_chars((count - len(rows)) * length).decode("ascii")
+                batch = [chars[i:i + length] for i in range(0, len(chars), length)]
+                if enforce:
+                    for cs in self.class_sets:
+                        batch = [pw for pw in batch if not cs.isdisjoint(pw)]
+                rows.extend(batch)
+            return ("\n".join(rows[:count]) + "\n").encode("ascii")
+        blocks = []
+        made = 0
+        while made < count:
+            want = count - made
+            # Oversize a little so class rejection rarely needs a second round
+            rows = want + want // 4 + 1 if enforce else want
+            chars = np.frombuffer(self._random_chars(rows * length), dtype=np.uint8).reshape(rows, length)
+            if enforce:
+                bits = np.bitwise_or.reduce(self.np_class_bits[chars], axis=1)
+                chars = chars[bits == self.all_bits]
+            chars = chars[:want]
+            out = np.empty((len(chars), length + 1), dtype=np.uint8)
+            out[:, :length] = chars
+            out[:, length] = ord("\n")
+            blocks.append(out.tobytes())
+            made += len(chars)
+        return b"".join(blocks)
+
+    def generate(self, length, count=1):
+        if not self.alphabet or length < 1 or count < 1:
+            return [""] * max(count, 0)
+        return self.generate_block(length, count).decode("ascii").split("\n")[:count]
+
+# Secure password generator that ensures all types if selected
+def secure_password(length, lower, upper, digit, symbol, ambiguous):
+    charsets = build_charsets(lower, upper, digit, symbol, ambiguous)
     if not charsets: return ""
-    chars = ''.join(charsets)
-    # Guarantee at least one from each type
-    password = [random.choice(cs) for cs in charsets]
-    while len(password) < length:
-        password.append(random.choice(chars))
-    random.shuffle(password)
-    return ''.join(password[:length])
+    return PasswordEngine(charsets).generate(length, 1)[0]
+
+def bulk_passwords(count, length, charsets, batch=100000):
+    # Yields newline-terminated byte blocks so millions can be streamed without holding them all
+    engine = PasswordEngine(charsets)
+    while count > 0:
+        n = min(batch, count)
+        yield engine.generate_block(length, n)
+        count -= n
+
+# Local leaked-password check, no network. The corpus is preprocessed once (build_breach_file) into a
+# sorted file of raw 20-byte SHA-1 digests; lookups mmap it and binary-search, so nothing is read into
+# memory up front. A Bloom filter next to it (".bloom") answers most misses without touching the file.
+BREACH_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "breached.sha1")
+DIGEST_SIZE = 20
+
+class BreachBloom:
+    MAGIC = b"PWBLOOM1"
+    HEADER = struct.Struct("<8sQI")
+
+    def __init__(self, path, readonly=True):
+        self.file = open(path, "rb" if readonly else "r+b")
+        access = mmap.ACCESS_READ if readonly else mmap.ACCESS_WRITE
+        self.map = mmap.mmap(self.file.fileno(), 0, access=access)
+        magic, self.bits, self.hashes = self.HEADER.unpack_from(self.map, 0)
+        if magic != self.MAGIC:
+            raise ValueError(f"{path} is not a leaked-password Bloom filter")
+
+    @classmethod
+    def create(cls, path, capacity, fp_rate=0.001):
+        bits = max(64, int(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        hashes = max(1, round(bits / max(capacity, 1) * math.log(2)))
+        with open(path, "wb") as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, bits, hashes))
+            f.truncate(cls.HEADER.size + (bits + 7) // 8)
+        return cls(path, readonly=False)
+
+    def _positions(self, digest):
+        # SHA-1 output is already uniform, so the double-hashing seeds come straight from it
+        h1, h2 = struct.unpack_from("<QQ", digest)
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def __contains__(self, digest):
+        base = self.HEADER.size
+        m = self.map
+        return all(m[base + (p >> 3)] & (1 << (p & 7)) for p in self._positions(digest))
+
+    def add(self, digest):
+        base = self.HEADER.size
+        m = self.map
+        for p in self._positions(digest):
+            m[base + (p >> 3)] |= 1 << (p & 7)
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+class BreachIndex:
+    def __init__(self, path, use_bloom=True):
+        self.file = open(path, "rb")
+        size = os.fstat(self.file.fileno()).st_size
+        if size % DIGEST_SIZE:
+            raise ValueError(f"{path} is not a sorted SHA-1 digest file")
+        self.count = size // DIGEST_SIZE
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.bloom = BreachBloom(path + ".bloom") if use_bloom and os.path.exists(path + ".bloom") else None
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, password):
+        return self.has_digest(hashlib.sha1(password.encode("utf-8")).digest())
+
+    def has_digest(self, digest):
+        if self.bloom is not None and digest not in self.bloom:
+            return False
+        m = self.map
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            off = mid * DIGEST_SIZE
+            probe = m[off:off + DIGEST_SIZE]
+            if probe < digest:
+                lo = mid + 1
+            elif probe > digest:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def close(self):
+        if self.bloom is not None:
+            self.bloom.close()
+        if self.count:
+            self.map.close()
+        self.file.close()
+
+def open_breach(path=BREACH_FILE):
+    # None when no corpus has been built; the app then skips the check
+    return BreachIndex(path) if os.path.exists(path) else None
+
+def _corpus_digests(path, hashed):
+    # Plain corpora hold one password per line; hashed ones (--hashed) hold "SHA1HEX[:count]" lines
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.rstrip(b"\r\n")
+            if not line:
+                continue
+            if hashed:
+                yield bytes.fromhex(line.split(b":", 1)[0].decode("ascii"))
+            else:
+                yield hashlib.sha1(line).digest()
+
+def _read_run(f, block=DIGEST_SIZE * 65536):
+    while True:
+        buf = f.read(block)
+        if not buf:
+            return
+        for off in range(0, len(buf), DIGEST_SIZE):
+            yield buf[off:off + DIGEST_SIZE]
+
+def build_breach_file(corpus, out_path=BREACH_FILE, hashed=False, bloom=True, run_size=5000000):
+    # External sort: sorted runs of run_size digests go to temp files, then one heapq.merge pass
+    # writes the deduplicated output, so memory stays bounded for corpora of any size.
+    with tempfile.TemporaryDirectory() as tmp:
+        runs, total, batch = [], 0, []
+
+        def spill():
+            batch.sort()
+            run_path = os.path.join(tmp, f"run{len(runs)}")
+            with open(run_path, "wb") as f:
+                f.write(b"".join(batch))
+            runs.append(run_path)
+            batch.clear()
+
+        for digest in _corpus_digests(corpus, hashed):
+            batch.append(digest)
+            total += 1
+            if len(batch) >= run_size:
+                spill()
+        if batch:
+            spill()
+        filt = BreachBloom.create(out_path + ".bloom", total) if bloom else None
+        files = [open(r, "rb") for r in runs]
+        written, last = 0, None
+        try:
+            with open(out_path, "wb") as out:
+                for digest in heapq.merge(*(_read_run(f) for f in files)):
+                    if digest == last:
+                        continue
+                    out.write(digest)
+                    if filt is not None:
+                        filt.add(digest)
+                    last = digest
+                    written += 1
+        finally:
+            for f in files:
+                f.close()
+            if filt is not None:
+                filt.map.flush()
+                filt.close()
+    return written
+
+def build_breach_cli(argv):
+    parser = argparse.ArgumentParser(prog="build-breach", description="Preprocess a leaked-password corpus for offline checks.")
+    parser.add_argument("corpus", help="one password per line, or SHA1HEX[:count] lines with --hashed")
+    parser.add_argument("--output", "-o", default=BREACH_FILE)
+    parser.add_argument("--hashed", action="store_true", help="corpus lines are SHA-1 hex digests")
+    parser.add_argument("--no-bloom", action="store_true")
+    args = parser.parse_args(argv)
+    n = build_breach_file(args.corpus, args.output, args.hashed, not args.no_bloom)
+    print(f"{n:,} unique hashes written to {args.output}")
+
+# Passphrases. The word list is kept as a fixed-stride file (every word NUL-padded to the longest one),
+# so word i is one slice of the mmap at HEADER.size + i * stride and nothing is parsed at startup.
+# It is built from a plain or diceware-style list (wordlist.txt) the first time it is needed.
+WORDLIST_TEXT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wordlist.txt")
+WORDLIST_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wordlist.fixed")
+BITS_STRENGTH = [  # (min bits, label, colour) for passphrases, where only the entropy is meaningful
+    (80, "Excellent", "#88cc44"),
+    (60, "Strong", "#33aaff"),
+    (40, "Medium", "#ffaa22"),
+    (0, "Weak", "#ee4433"),
+]
+
+class WordList:
+    MAGIC = b"PWWORDS1"
+    HEADER = struct.Struct("<8sII")
+
+    def __init__(self, path=WORDLIST_FILE, sep="-"):
+        self.sep = sep
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.stride, self.count = self.HEADER.unpack_from(self.map, 0)
+        if magic != self.MAGIC or not self.count:
+            raise ValueError(f"{path} is not a fixed-stride word list")
+        self.bits = math.log2(self.count)  # entropy per word
+        self.limit = 2 ** 32 - 2 ** 32 % self.count
+
+    @classmethod
+    def build(cls, src, dst):
+        # Diceware lines ("11111 abacus") keep their last field; duplicates keep the first position
+        with open(src, encoding="utf-8") as f:
+            words = list(dict.fromkeys(line.split()[-1] for line in f if line.strip()))
+        encoded = [w.encode("utf-8") for w in words]
+        stride = max(map(len, encoded), default=1)
+        with open(dst, "wb") as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, stride, len(encoded)))
+            f.write(b"".join(w.ljust(stride, b"\0") for w in encoded))
+        return len(encoded)
+
+    def word(self, i):
+        off = self.HEADER.size + i * self.stride
+        return self.map[off:off + self.stride].rstrip(b"\0").decode("utf-8")
+
+    def _random_indices(self, n):
+        # Uniform indices from 32-bit CSPRNG draws, rejecting the top partial range
+        out = []
+        while len(out) < n:
+            need = n - len(out)
+            draws = memoryview(os.urandom(4 * (need + need // 8 + 8))).cast("I")
+            out += [x % self.count for x in draws if x < self.limit]
+        return out[:n]
+
+    def generate(self, words, count=1):
+        # Same shape as PasswordEngine.generate, so unbreached() works for both
+        picked = [self.word(i) for i in self._random_indices(words * count)]
+        return [self.sep.join(picked[k:k + words]) for k in range(0, len(picked), words)]
+
+    def entropy(self, words):
+        return words * self.bits
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+def open_wordlist(text=WORDLIST_TEXT, path=WORDLIST_FILE):
+    # (Re)build the fixed-stride file when the text list is new or newer; None without any list
+    if os.path.exists(text) and (not os.path.exists(path) or os.path.getmtime(text) > os.path.getmtime(path)):
+        WordList.build(text, path)
+    return WordList(path) if os.path.exists(path) else None
+
+def label_for_bits(bits):
+    for min_bits, label, color in BITS_STRENGTH:
+        if bits >= min_bits:
+            return label, color
+
+def bulk_passphrases(count, words, wordlist, batch=100000):
+    while count > 0:
+        n = min(batch, count)
+        yield ("\n".join(wordlist.generate(words, n)) + "\n").encode("utf-8")
+        count -= n
+
+def unbreached(engine, length, count, breach):
+    # Generate `count` passwords, replacing any that show up in the leaked-password corpus
+    passwords = [pw for pw in engine.generate(length, count) if breach is None or pw not in breach]
+    while breach is not None and len(passwords) < count:
+        passwords += [pw for pw in engine.generate(length, count - len(passwords)) if pw not in breach]
+    return passwords
 
 class PasswordGeneratorApp:
     def __init__(self, root):
         self.root = root
         self.theme = 0
+        self.passwords = []
+        self.breach = open_breach()
+        self.wordlist = None  # opened on first passphrase request
         self.root.title("🔑 Ultra Password Generator")
         self.root.configure(bg="#eaf6f6")
         self.font_main = ("Comic Sans MS",14,"bold")
@@ -72,6 +647,7 @@ class PasswordGeneratorApp:
         self.opt_digit = tk.BooleanVar(value=True)
         self.opt_symbol = tk.BooleanVar(value=True)
         self.opt_ambig = tk.BooleanVar(value=True)
+        self.opt_phrase = tk.BooleanVar(value=False)
 
         tk.Checkbutton(root, text="a-z", variable=self.opt_lower, font=self.font_label,
                        bg=self.colors[self.theme]["bg"], fg=self.colors[self.theme]["fg"]).grid(row=1, column=0, padx=8)
@@ -82,8 +658,9 @@ class PasswordGeneratorApp:
         tk.Checkbutton(root, text="@#$", variable=self.opt_symbol, font=self.font_label,
                        bg=self.colors[self.theme]["bg"], fg=self.colors[self.theme]["fg"]).grid(row=2, column=1)
         tk.Checkbutton(root, text="No ambiguous chars", variable=self.opt_ambig, font=self.font_label,
-                       bg=self.colors[self.theme]["bg"], fg=self.colors[self.theme]["fg"]).grid(row=3, column=0,
-                                                                                                columnspan=2)
+                       bg=self.colors[self.theme]["bg"], fg=self.colors[self.theme]["fg"]).grid(row=3, column=0)
+        tk.Checkbutton(root, text="Passphrase (length = words)", variable=self.opt_phrase, font=self.font_label,
+                       bg=self.colors[self.theme]["bg"], fg=self.colors[self.theme]["fg"]).grid(row=3, column=1)
 
         tk.Label(root, text="How many suggestions?", font=self.font_label, bg=self.colors[self.theme]["bg"], fg=self.colors[self.theme]["fg"]).grid(row=4, column=0, pady=7)
         self.amount_entry = tk.Entry(root, width=7, font=self.font_label, bg=self.colors[self.theme]["list"])
@@ -116,11 +693,19 @@ class PasswordGeneratorApp:
         self.entropy_label = tk.Label(root, text="Entropy: ", font=self.font_label, bg=self.colors[self.theme]["meterbg"], fg=self.colors[self.theme]["fg"])
         self.entropy_label.grid(row=10, column=0, columnspan=2, pady=2)
 
+        # Live strength check of a typed password, including the leaked-password corpus
+        tk.Label(root, text="Check password:", font=self.font_label, bg=self.colors[self.theme]["bg"], fg=self.colors[self.theme]["fg"]).grid(row=11, column=0, padx=8, pady=4)
+        self.check_entry = tk.Entry(root, width=20, font=self.font_label, bg=self.colors[self.theme]["list"], show="•")
+        self.check_entry.grid(row=11, column=1, pady=4)
+        self.check_entry.bind("<KeyRelease>", lambda e: self.check_typed())
+        self.check_label = tk.Label(root, text="", font=self.font_label, bg=self.colors[self.theme]["bg"], fg=self.colors[self.theme]["fg"])
+        self.check_label.grid(row=12, column=0, columnspan=2, pady=2)
+
     def switch_theme(self):
         self.theme = 1 - self.theme
         c = self.colors[self.theme]
         self.root.configure(bg=c["bg"])
-        for w in [self.length_entry, self.amount_entry, self.result_box, self.meter_canvas]:
+        for w in [self.length_entry, self.amount_entry, self.check_entry, self.result_box, self.meter_canvas]:
             w.config(bg=c["list"])
         for w in [self.gen_btn, self.theme_btn, self.copy_btn]:
             w.config(bg=c["btn"])
@@ -135,10 +720,13 @@ class PasswordGeneratorApp:
             length = int(self.length_entry.get())
             amount = int(self.amount_entry.get())
         except:
-            tk.messagebox.showerror("Invalid Input", "Length and amount must be integers.")
+            messagebox.showerror("Invalid Input", "Length and amount must be integers.")
+            return
+        if self.opt_phrase.get():
+            self.generate_phrases(length, amount)
             return
         if length < 6 or amount < 1:
-            tk.messagebox.showerror("Invalid Input", "Length must be ≥6, amount ≥1.")
+            messagebox.showerror("Invalid Input", "Length must be ≥6, amount ≥1.")
             return
 
         lower = self.opt_lower.get()
@@ -147,21 +735,38 @@ class PasswordGeneratorApp:
         symbol = self.opt_symbol.get()
         ambiguous = self.opt_ambig.get()
 
+        charsets = build_charsets(lower, upper, digit, symbol, ambiguous)
+        passwords = unbreached(PasswordEngine(charsets), length, amount, self.breach) if charsets else []
+        self.show_results(passwords, score_batch(passwords))
+
+    def generate_phrases(self, words, amount):
+        if words < 3 or amount < 1:
+            messagebox.showerror("Invalid Input", "A passphrase needs ≥3 words, amount ≥1.")
+            return
+        if self.wordlist is None:
+            self.wordlist = open_wordlist()
+        if self.wordlist is None:
+            messagebox.showerror("Passphrase", "No word list found. Put wordlist.txt next to this script.")
+            return
+        phrases = unbreached(self.wordlist, words, amount, self.breach)
+        bits = self.wordlist.entropy(words)
+        self.show_results(phrases, [label_for_bits(bits) + (bits,)] * len(phrases))
+
+    def show_results(self, passwords, scores):
         self.result_box.delete(0, tk.END)
-        passwords = []
-        for _ in range(amount):
-            password = secure_password(length, lower, upper, digit, symbol, ambiguous)
-            passwords.append(password)
+        self.passwords = passwords
+        for i, (password, (label, color, entropy)) in enumerate(zip(passwords, scores)):
             display_pw = password if self.show_var.get() else '*' * len(password)
-            self.result_box.insert(tk.END, display_pw)
-        # Score for first password
-        if passwords:
-            label, color, entropy = score(passwords[0])
+            self.result_box.insert(tk.END, f"{display_pw}  {label} {entropy:.0f}b")
+            self.result_box.itemconfig(i, fg=color)
+        # Meter shows the first password; the listbox colours show the rest
+        if scores:
+            label, color, entropy = scores[0]
             self.str_label.config(text=f"Strength: {label}")
             self.entropy_label.config(text=f"Entropy: {round(entropy,2)} bits")
             self.meter_canvas.delete("all")
-            meter_len = int(entropy)
-            self.meter_canvas.create_rectangle(5, 5, min(155,meter_len*2), 14, fill=color, outline="")
+            # Full bar at 128 bits
+            self.meter_canvas.create_rectangle(5, 5, 5 + min(150, int(entropy * 150 / 128)), 14, fill=color, outline="")
         else:
             self.str_label.config(text="Strength: ")
             self.entropy_label.config(text="Entropy: ")
@@ -170,28 +775,73 @@ class PasswordGeneratorApp:
     def copy_password(self):
         sel = self.result_box.curselection()
         if not sel:
-            tk.messagebox.showinfo("Copy", "Select a password to copy.")
+            messagebox.showinfo("Copy", "Select a password to copy.")
             return
-        pw = self.result_box.get(sel)
-        # Copy actual password not hidden (if hidden, index matches passwords list)
-        if not self.show_var.get():
-            length = int(self.length_entry.get())
-            lower = self.opt_lower.get()
-            upper = self.opt_upper.get()
-            digit = self.opt_digit.get()
-            symbol = self.opt_symbol.get()
-            ambiguous = self.opt_ambig.get()
-            password = secure_password(length, lower, upper, digit, symbol, ambiguous)
-            pw = password
+        # Copy the real password, not the (possibly masked) listbox text
+        pw = self.passwords[sel[0]]
         self.root.clipboard_clear()
         self.root.clipboard_append(pw)
         self.root.update()
-        tk.messagebox.showinfo("Copy", "Password copied to clipboard.")
+        messagebox.showinfo("Copy", "Password copied to clipboard.")
+
+    def check_typed(self):
+        # Runs on every keystroke: pattern estimate plus the leaked-password lookup
+        pw = self.check_entry.get()
+        if not pw:
+            self.check_label.config(text="")
+            return
+        if self.breach is not None and pw in self.breach:
+            self.check_label.config(text="⚠ Found in leaked passwords, don't use it", fg="#ee4433")
+            return
+        label, color, bits, patterns = estimate(pw)
+        text = f"{label}: ~{bits:.0f} bits"
+        if patterns:
+            kind, token = max(patterns, key=lambda p: len(p[1]))
+            text += f" ({kind} '{token}')"
+        self.check_label.config(text=text, fg=color)
 
     def toggle_show(self):
         self.generate()
 
+def bulk_cli(argv):
+    parser = argparse.ArgumentParser(description="Generate passwords in bulk to stdout or a file.")
+    parser.add_argument("count", type=int)
+    parser.add_argument("--length", type=int, default=16)
+    parser.add_argument("--no-lower", action="store_true")
+    parser.add_argument("--no-upper", action="store_true")
+    parser.add_argument("--no-digit", action="store_true")
+    parser.add_argument("--no-symbol", action="store_true")
+    parser.add_argument("--allow-ambiguous", action="store_true")
+    parser.add_argument("--words", type=int, help="generate passphrases of this many words instead")
+    parser.add_argument("--separator", default="-", help="passphrase word separator")
+    parser.add_argument("--output", "-o", help="file to write (default: stdout)")
+    args = parser.parse_args(argv)
+    if args.words:
+        wordlist = open_wordlist()
+        if wordlist is None:
+            parser.error(f"no word list found at {WORDLIST_TEXT}")
+        wordlist.sep = args.separator
+        blocks = bulk_passphrases(args.count, args.words, wordlist)
+    else:
+        charsets = build_charsets(not args.no_lower, not args.no_upper, not args.no_digit,
+                                  not args.no_symbol, not args.allow_ambiguous)
+        if not charsets:
+            parser.error("at least one character class is required")
+        blocks = bulk_passwords(args.count, args.length, charsets)
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for block in blocks:
+            out.write(block)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = PasswordGeneratorApp(root)
-    root.mainloop()
+    if sys.argv[1:2] == ["build-breach"]:
+        build_breach_cli(sys.argv[2:])
+    elif len(sys.argv) > 1:
+        bulk_cli(sys.argv[1:])
+    else:
+        root = tk.Tk()
+        app = PasswordGeneratorApp(root)
+        root.mainloop()
@@ -1,50 +1,16 @@
 import tkinter as tk
 from tkinter import messagebox
-import math
+import sys
+from unit_model import (UNIT_CATEGORIES, convert_value, convert_units, convert_to_all, parse_query, add_unit,
+                        load_custom_units, save_custom_unit, convert_cli)
 
 THEMES = [
     {"bg": "#f9fde7", "btn": "#bae1ff", "result": "#ffeebb", "fg": "#253456", "highlight": "#4b9cd3"},
     {"bg": "#212c3d", "btn": "#6c7b95", "result": "#29335c", "fg": "#fff1eb", "highlight": "#ffc857"},
 ]
 
-UNIT_CATEGORIES = {
-    "Length": {
-        "meter": 1.0,
-        "kilometer": 1000.0,
-        "mile": 1609.34,
-        "yard": 0.9144,
-        "foot": 0.3048,
-        "inch": 0.0254,
-        "cm": 0.01,
-        "mm": 0.001,
-    },
-    "Mass": {
-        "gram": 1.0,
-        "kilogram": 1000.0,
-        "pound": 453.592,
-        "ounce": 28.3495,
-        "tonne": 1e6,
-        "milligram": 0.001,
-    },
-    "Temperature": {
-        "celsius": (1, 0),
-        "fahrenheit": (5/9, -32),
-        "kelvin": (1, -273.15),
-    },
-    "Time": {
-        "second": 1.0,
-        "minute": 60.0,
-        "hour": 3600.0,
-        "day": 86400.0,
-        "week": 604800.0,
-    },
-    "Speed": {
-        "m/s": 1.0,
-        "km/h": 0.277778,
-        "mph": 0.44704,
-        "knot": 0.514444,
-    }
-}
+HISTORY_LIMIT = 100  # conversions kept in the history list
+TABLE_DELAY = 150  # ms of typing pause before the live table recomputes
 
 class UnitConverterApp:
     def __init__(self, root):
@@ -91,7 +57,25 @@ class UnitConverterApp:
         self.history_box.grid(row=6, column=0, columnspan=3, padx=6, pady=3)
         self.copy_btn = tk.Button(root, text="Copy Result", command=self.copy_result, font=("Helvetica",12), bg=THEMES[self.theme]["btn"], fg=THEMES[self.theme]["fg"])
         self.copy_btn.grid(row=7, column=1, pady=7)
+
+        # User-defined unit: 1 <name> = <factor> <From unit>
+        tk.Label(root, text="New unit = n × From:", font=("Helvetica",12), bg=THEMES[self.theme]["bg"], fg=THEMES[self.theme]["fg"]).grid(row=8, column=0, sticky="e")
+        self.new_name_entry = tk.Entry(root, font=("Consolas",12), width=12, bg="#eaf6f6", fg=THEMES[self.theme]["fg"])
+        self.new_name_entry.grid(row=8, column=1, padx=6, sticky="w")
+        self.new_factor_entry = tk.Entry(root, font=("Consolas",12), width=10, bg="#eaf6f6", fg=THEMES[self.theme]["fg"])
+        self.new_factor_entry.grid(row=8, column=2, padx=6, sticky="w")
+        self.add_unit_btn = tk.Button(root, text="Add Unit", command=self.add_custom_unit, font=("Helvetica",12), bg=THEMES[self.theme]["highlight"], fg="#fff")
+        self.add_unit_btn.grid(row=9, column=1, pady=5)
+
+        # Live table: the value in every unit of the category, updated while typing
+        self.table_frame = tk.Frame(root, bg=THEMES[self.theme]["bg"])
+        self.table_frame.grid(row=10, column=0, columnspan=3, padx=6, pady=6)
+        self.table_cells = {}  # unit -> (name label, value label)
+        self.table_text = {}  # unit -> text currently shown, so unchanged cells aren't touched
+        self._table_job = None
         self.update_units("Length")
+        self.amount_var.trace_add("write", lambda *a: self.schedule_table())
+        self.unit1_var.trace_add("write", lambda *a: self.schedule_table())
 
     def switch_theme(self):
         self.theme = 1 - self.theme
@@ -111,6 +95,10 @@ class UnitConverterApp:
         self.result_box.config(bg=th["result"], fg=th["fg"])
         self.amount_entry.config(bg="#eaf6f6", fg=th["fg"])
         self.copy_btn.config(bg=th["btn"], fg=th["fg"])
+        self.table_frame.config(bg=th["bg"])
+        for name_lbl, value_lbl in self.table_cells.values():
+            name_lbl.config(bg=th["bg"], fg=th["fg"])
+            value_lbl.config(bg=th["bg"], fg=th["fg"])
 
     def update_units(self, cat):
         # Update 'from' and 'to' menus
@@ -124,38 +112,83 @@ class UnitConverterApp:
             menu2.add_command(label=u, command=tk._setit(self.unit2_var, u))
         self.unit1_var.set(list(units.keys())[0])
         self.unit2_var.set(list(units.keys())[1])
+        self.build_table()
+
+    def build_table(self):
+        # One row of labels per unit; rebuilt only when the category or its units change
+        for name_lbl, value_lbl in self.table_cells.values():
+            name_lbl.destroy()
+            value_lbl.destroy()
+        th = THEMES[self.theme]
+        self.table_cells = {}
+        self.table_text = {}
+        for i, u in enumerate(UNIT_CATEGORIES[self.cat_var.get()]):
+            name_lbl = tk.Label(self.table_frame, text=u, font=("Consolas",11), anchor="e", width=14, bg=th["bg"], fg=th["fg"])
+            value_lbl = tk.Label(self.table_frame, text="", font=("Consolas",11), anchor="w", width=22, bg=th["bg"], fg=th["fg"])
+            name_lbl.grid(row=i, column=0, sticky="e")
+            value_lbl.grid(row=i, column=1, sticky="w", padx=6)
+            self.table_cells[u] = (name_lbl, value_lbl)
+        self.refresh_table()
+
+    def schedule_table(self):
+        # Debounced: a burst of keystrokes triggers one recompute
+        if self._table_job:
+            self.root.after_cancel(self._table_job)
+        self._table_job = self.root.after(TABLE_DELAY, self.refresh_table)
+
+    def refresh_table(self):
+        self._table_job = None
+        cat = self.cat_var.get()
+        try:
+            values = convert_to_all(cat, float(self.amount_var.get()), self.unit1_var.get())
+            texts = {u: f"{v:.6g}" for u, v in values}
+        except (ValueError, KeyError):
+            texts = {}
+        for u, (_, value_lbl) in self.table_cells.items():
+            text = texts.get(u, "")
+            if self.table_text.get(u) != text:
+                value_lbl.config(text=text)
+                self.table_text[u] = text
 
     def convert(self):
         cat = self.cat_var.get()
+        text = self.amount_var.get()
         try:
-            value = float(self.amount_var.get())
-        except:
-            self.result_box.delete(0, tk.END)
-            self.result_box.insert(0, "Invalid value")
-            return
-        from_u = self.unit1_var.get()
-        to_u = self.unit2_var.get()
-        if cat != "Temperature":
-            units = UNIT_CATEGORIES[cat]
-            val_si = value * units[from_u]
-            result = val_si / units[to_u]
-        else:
-            # Handle temperature conversions
-            temp = value
-            if from_u == "fahrenheit":
-                temp = (value - 32) * 5/9
-            elif from_u == "kelvin":
-                temp = value - 273.15
-            if to_u == "celsius":
-                result = temp
-            elif to_u == "fahrenheit":
-                result = temp * 9/5 + 32
-            elif to_u == "kelvin":
-                result = temp + 273.15
+            value = float(text)
+            from_u = self.unit1_var.get()
+            to_u = self.unit2_var.get()
+            result = convert_value(cat, value, from_u, to_u)
+        except ValueError:
+            # Free-form "3 kWh to MJ" converts between any compatible unit expressions
+            query = parse_query(text)
+            try:
+                value, from_u, to_u = query
+                result = convert_units(value, from_u, to_u)
+            except (TypeError, ValueError) as e:
+                self.result_box.delete(0, tk.END)
+                self.result_box.insert(0, f"Invalid: {e}" if query else "Invalid value")
+                return
         out_str = f"{value} {from_u} = {result:.4f} {to_u}"
         self.result_box.delete(0, tk.END)
         self.result_box.insert(0, out_str)
         self.history_box.insert(tk.END, out_str)
+        if self.history_box.size() > HISTORY_LIMIT:
+            self.history_box.delete(0)
+
+    def add_custom_unit(self):
+        cat = self.cat_var.get()
+        name = self.new_name_entry.get().strip()
+        try:
+            factor = float(self.new_factor_entry.get())
+        except ValueError:
+            messagebox.showerror("Add Unit", "Factor must be a number.")
+            return
+        if not name or factor == 0 or name in UNIT_CATEGORIES[cat]:
+            messagebox.showerror("Add Unit", "Enter a new unit name and a non-zero factor.")
+            return
+        add_unit(cat, name, factor, relative_to=self.unit1_var.get())
+        save_custom_unit(cat, name)
+        self.update_units(cat)
 
     def copy_result(self):
         res = self.result_box.get()
@@ -166,6 +199,9 @@ class UnitConverterApp:
             messagebox.showinfo("Copied", f"Result copied to clipboard!")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(convert_cli(sys.argv[1:]))
+    load_custom_units()
     root = tk.Tk()
     app = UnitConverterApp(root)
     root.mainloop()
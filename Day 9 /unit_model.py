@@ -0,0 +1,434 @@
+# Tk-free unit model for the Day 9 converter: unit tables, compiled affine conversions, custom units,
+# a unit expression parser, vectorized array conversion and a streaming CSV column converter.
+#
+#   python unit_model.py Temperature fahrenheit celsius readings.csv --columns temp_f -o out.csv
+#   python unit_model.py Length foot meter a.csv b.csv c.csv --columns depth --workers 4
+import argparse
+import csv
+import functools
+import itertools
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # optional: conversions fall back to plain Python lists
+    np = None
+
+UNIT_CATEGORIES = {
+    "Length": {
+        "meter": 1.0,
+        "kilometer": 1000.0,
+        "mile": 1609.34,
+        "yard": 0.9144,
+        "foot": 0.3048,
+        "inch": 0.0254,
+        "cm": 0.01,
+        "mm": 0.001,
+    },
+    "Mass": {
+        "gram": 1.0,
+        "kilogram": 1000.0,
+        "pound": 453.592,
+        "ounce": 28.3495,
+        "tonne": 1e6,
+        "milligram": 0.001,
+    },
+    "Temperature": {
+        "celsius": (1, 0),
+        "fahrenheit": (5/9, -32),
+        "kelvin": (1, -273.15),
+    },
+    "Time": {
+        "second": 1.0,
+        "minute": 60.0,
+        "hour": 3600.0,
+        "day": 86400.0,
+        "week": 604800.0,
+    },
+    "Speed": {
+        "m/s": 1.0,
+        "km/h": 0.277778,
+        "mph": 0.44704,
+        "knot": 0.514444,
+    }
+}
+
+CUSTOM_UNITS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "custom_units.json")
+
+# Each unit maps to the category's base unit as base = a * value + b: plain factors are (factor, 0) and
+# temperature's (scale, offset) pairs mean base = (value + offset) * scale. A category is compiled once
+# into a from -> to table of (scale, offset) pairs, so every conversion is a single multiply-add.
+_compiled = {}
+
+def _affine(spec):
+    if isinstance(spec, (tuple, list)):
+        scale, offset = spec
+        return scale, scale * offset
+    return spec, 0.0
+
+def compile_category(cat):
+    table = _compiled.get(cat)
+    if table is None:
+        coeffs = {u: _affine(spec) for u, spec in UNIT_CATEGORIES[cat].items()}
+        table = {(f, t): (a1 / a2, (b1 - b2) / a2)
+                 for f, (a1, b1) in coeffs.items() for t, (a2, b2) in coeffs.items()}
+        _compiled[cat] = table
+    return table
+
+def conversion(cat, from_u, to_u):
+    return compile_category(cat)[from_u, to_u]
+
+def convert_value(cat, value, from_u, to_u):
+    scale, offset = compile_category(cat)[from_u, to_u]
+    return value * scale + offset
+
+_rows = {}
+
+def conversion_row(cat, from_u):
+    # (units, scales, offsets) converting from_u into every unit of the category, as arrays when
+    # numpy is available; cached per (category, from unit)
+    row = _rows.get((cat, from_u))
+    if row is None:
+        table = compile_category(cat)
+        units = list(UNIT_CATEGORIES[cat])
+        scales = [table[from_u, u][0] for u in units]
+        offsets = [table[from_u, u][1] for u in units]
+        if np is not None:
+            scales, offsets = np.array(scales), np.array(offsets)
+        row = _rows[cat, from_u] = (units, scales, offsets)
+    return row
+
+def convert_to_all(cat, value, from_u):
+    # [(unit, value)] for every unit of the category in one vectorized multiply-add
+    units, scales, offsets = conversion_row(cat, from_u)
+    if np is not None:
+        return list(zip(units, (scales * value + offsets).tolist()))
+    return [(u, value * a + b) for u, a, b in zip(units, scales, offsets)]
+
+def _invalidate(cat):
+    _compiled.pop(cat, None)
+    for key in [k for k in _rows if k[0] == cat]:
+        del _rows[key]
+    parse_unit.cache_clear()
+
+def add_unit(cat, name, factor, offset=0.0, relative_to=None):
+    # 1 `name` = factor * `relative_to` + offset (relative_to defaults to the category's base unit)
+    a, b = _affine(UNIT_CATEGORIES[cat][relative_to]) if relative_to else (1.0, 0.0)
+    a, b = a * factor, a * offset + b
+    UNIT_CATEGORIES[cat][name] = (a, b / a) if b else a
+    _invalidate(cat)
+
+def load_custom_units(path=CUSTOM_UNITS_FILE):
+    # Saved as {category: {name: factor or [scale, offset]}} in base-unit terms
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        custom = json.load(f)
+    for cat, units in custom.items():
+        if cat in UNIT_CATEGORIES:
+            UNIT_CATEGORIES[cat].update({u: tuple(v) if isinstance(v, list) else v for u, v in units.items()})
+            _invalidate(cat)
+    return custom
+
+def save_custom_unit(cat, name, path=CUSTOM_UNITS_FILE):
+    custom = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            custom = json.load(f)
+    custom.setdefault(cat, {})[name] = UNIT_CATEGORIES[cat][name]
+    with open(path, "w") as f:
+        json.dump(custom, f, indent=2)
+
+# Unit expressions ("km/h", "kWh", "m/s^2", "J/(kg*K)", "N m"): products, quotients, integer powers
+# and SI prefixes, reduced to a scale factor relative to SI base units and a dimension vector of
+# exponents over (m, kg, s, A, K, mol, cd). Parsed expressions are memoized by parse_unit().
+BASE_DIMS = ("m", "kg", "s", "A", "K", "mol", "cd")
+SI_PREFIXES = {"Y": 1e24, "Z": 1e21, "E": 1e18, "P": 1e15, "T": 1e12, "G": 1e9, "M": 1e6, "k": 1e3,
+               "h": 1e2, "da": 1e1, "d": 1e-1, "c": 1e-2, "m": 1e-3, "µ": 1e-6, "μ": 1e-6, "u": 1e-6,
+               "n": 1e-9, "p": 1e-12, "f": 1e-15, "a": 1e-18}
+_DIMLESS = (0,) * len(BASE_DIMS)
+
+def _dims(**exps):
+    return tuple(exps.get(d, 0) for d in BASE_DIMS)
+
+# symbol: (scale to SI, dimensions, takes SI prefixes)
+UNIT_SYMBOLS = {
+    "m": (1.0, _dims(m=1), True), "g": (1e-3, _dims(kg=1), True), "s": (1.0, _dims(s=1), True),
+    "A": (1.0, _dims(A=1), True), "K": (1.0, _dims(K=1), True), "mol": (1.0, _dims(mol=1), True),
+    "cd": (1.0, _dims(cd=1), True), "Hz": (1.0, _dims(s=-1), True),
+    "N": (1.0, _dims(kg=1, m=1, s=-2), True), "Pa": (1.0, _dims(kg=1, m=-1, s=-2), True),
+    "J": (1.0, _dims(kg=1, m=2, s=-2), True), "W": (1.0, _dims(kg=1, m=2, s=-3), True),
+    "Wh": (3600.0, _dims(kg=1, m=2, s=-2), True), "Ah": (3600.0, _dims(A=1, s=1), True), "C": (1.0, _dims(A=1, s=1), True),
+    "V": (1.0, _dims(kg=1, m=2, s=-3, A=-1), True), "ohm": (1.0, _dims(kg=1, m=2, s=-3, A=-2), True),
+    "L": (1e-3, _dims(m=3), True), "l": (1e-3, _dims(m=3), True), "bar": (1e5, _dims(kg=1, m=-1, s=-2), True),
+    "eV": (1.602176634e-19, _dims(kg=1, m=2, s=-2), True), "t": (1e3, _dims(kg=1), False),
+    "min": (60.0, _dims(s=1), False), "h": (3600.0, _dims(s=1), False), "d": (86400.0, _dims(s=1), False),
+    "in": (0.0254, _dims(m=1), False), "ft": (0.3048, _dims(m=1), False), "yd": (0.9144, _dims(m=1), False),
+    "mi": (1609.34, _dims(m=1), False), "lb": (0.453592, _dims(kg=1), False), "oz": (0.0283495, _dims(kg=1), False),
+    "kn": (0.514444, _dims(m=1, s=-1), False), "cal": (4.184, _dims(kg=1, m=2, s=-2), True),
+    "psi": (6894.757, _dims(kg=1, m=-1, s=-2), False), "1": (1.0, _DIMLESS, False),
+}
+# Unit names from UNIT_CATEGORIES resolve too (custom units included), via their category's base unit;
+# temperatures count as intervals here, absolute temperatures go through convert_value()
+CATEGORY_BASES = {"Length": "m", "Mass": "g", "Time": "s", "Speed": "m/s", "Temperature": "K"}
+_TOKEN_RE = re.compile(r"\s*(?:(\*\*|\^)|([*/·()])|([-+]?\d+)|([A-Za-zµμΩ_]+)|([²³]))")
+
+def _lookup(name):
+    name = "ohm" if name == "Ω" else name
+    if name in UNIT_SYMBOLS:
+        scale, dims, _ = UNIT_SYMBOLS[name]
+        return scale, dims
+    for cat, units in UNIT_CATEGORIES.items():
+        if name in units:
+            base_scale, dims = parse_unit(CATEGORY_BASES[cat])
+            return _affine(units[name])[0] * base_scale, dims
+    for prefix in sorted(SI_PREFIXES, key=len, reverse=True):
+        rest = name[len(prefix):]
+        if name.startswith(prefix) and rest in UNIT_SYMBOLS and UNIT_SYMBOLS[rest][2]:
+            scale, dims, _ = UNIT_SYMBOLS[rest]
+            return SI_PREFIXES[prefix] * scale, dims
+    raise ValueError(f"unknown unit {name!r}")
+
+def _tokens(expr):
+    pos, out = 0, []
+    expr = expr.strip()
+    while pos < len(expr):
+        m = _TOKEN_RE.match(expr, pos)
+        if not m or m.end() == pos:
+            raise ValueError(f"can't parse unit {expr!r} at {expr[pos:]!r}")
+        pos = m.end()
+        power, op, num, name, sup = m.groups()
+        if power:
+            out.append(("^", None))
+        elif op:
+            out.append((op.replace("·", "*"), None))
+        elif num:
+            out.append(("num", int(num)))
+        elif name:
+            out.append(("name", name))
+        else:
+            out.extend([("^", None), ("num", 2 if sup == "²" else 3)])
+    return out
+
+def _parse_product(tokens, i):
+    # product := power (('*' | '/' | juxtaposition) power)*
+    scale, dims, i = _parse_power(tokens, i)
+    while i < len(tokens) and tokens[i][0] not in (")",):
+        kind = tokens[i][0]
+        sign = -1 if kind == "/" else 1
+        if kind in ("*", "/"):
+            i += 1
+        s2, d2, i = _parse_power(tokens, i)
+        scale *= s2 ** sign
+        dims = tuple(a + sign * b for a, b in zip(dims, d2))
+    return scale, dims, i
+
+def _parse_power(tokens, i):
+    # power := atom ('^' int | int)?  where a bare trailing int ("m2") is also an exponent
+    if i >= len(tokens):
+        raise ValueError("unit expression ends early")
+    kind, val = tokens[i]
+    if kind == "(":
+        scale, dims, i = _parse_product(tokens, i + 1)
+        if i >= len(tokens) or tokens[i][0] != ")":
+            raise ValueError("missing ')' in unit expression")
+        i += 1
+    elif kind == "name":
+        scale, dims = _lookup(val)
+        i += 1
+    elif kind == "num" and val == 1:
+        scale, dims, i = 1.0, _DIMLESS, i + 1
+    else:
+        raise ValueError(f"unexpected {val if val is not None else kind!r} in unit expression")
+    caret = i < len(tokens) and tokens[i][0] == "^"
+    if caret:
+        i += 1
+    if i < len(tokens) and tokens[i][0] == "num" and kind != "num":
+        exp = tokens[i][1]
+        try:
+            scale = scale ** exp
+        except OverflowError:
+            scale = 0.0
+        if not 0.0 < scale < float("inf"):
+            raise ValueError(f"unit power ^{exp} is out of range")
+        dims = tuple(d * exp for d in dims)
+        i += 1
+    elif caret:
+        raise ValueError("'^' needs an integer exponent")
+    return scale, dims, i
+
+@functools.lru_cache(maxsize=1024)
+def parse_unit(expr):
+    # (scale to SI, dimension vector) for a unit expression
+    tokens = _tokens(expr)
+    scale, dims, i = _parse_product(tokens, 0)
+    if i != len(tokens):
+        raise ValueError(f"unbalanced ')' in unit {expr!r}")
+    if not 0.0 < scale < float("inf"):
+        raise ValueError(f"unit {expr!r} is out of range")
+    return scale, dims
+
+def unit_factor(from_expr, to_expr):
+    s1, d1 = parse_unit(from_expr)
+    s2, d2 = parse_unit(to_expr)
+    if d1 != d2:
+        raise ValueError(f"can't convert {from_expr} ({describe_dims(d1)}) to {to_expr} ({describe_dims(d2)})")
+    return s1 / s2
+
+def _kelvin_scale(expr):
+    # Kelvins per unit if expr is just K with an optional SI prefix ("K", "mK"), else None
+    if expr == "K":
+        return 1.0
+    if expr.endswith("K") and expr[:-1] in SI_PREFIXES:
+        return SI_PREFIXES[expr[:-1]]
+    return None
+
+def convert_units(value, from_expr, to_expr):
+    # A bare temperature on both sides is absolute: names go through the category table and
+    # K (prefixed or not) is read as kelvin, so offsets are kept. Compound expressions such as
+    # J/(kg*K) treat temperatures as intervals, which is ambiguous for a bare one, so a bare
+    # temperature against a compound one is rejected.
+    temps = UNIT_CATEGORIES["Temperature"]
+    f, t = from_expr.strip(), to_expr.strip()
+    f_k, t_k = _kelvin_scale(f), _kelvin_scale(t)
+    f_abs, t_abs = f in temps or f_k is not None, t in temps or t_k is not None
+    if f_abs and t_abs:
+        kelvin = value * f_k if f_k is not None else convert_value("Temperature", value, f, "kelvin")
+        return kelvin / t_k if t_k is not None else convert_value("Temperature", kelvin, "kelvin", t)
+    if f_abs or t_abs:
+        if parse_unit(f)[1] == parse_unit(t)[1]:
+            raise ValueError(f"can't tell if {from_expr} -> {to_expr} is an absolute temperature or an interval")
+    return value * unit_factor(from_expr, to_expr)
+
+_QUERY_RE = re.compile(r"\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*(.+?)\s+(?:to|in|->)\s+(.+?)\s*$")
+
+def parse_query(text):
+    # "3.5 kWh to MJ" -> (3.5, "kWh", "MJ"), or None if it doesn't look like a conversion
+    m = _QUERY_RE.match(text)
+    return (float(m.group(1)), m.group(2), m.group(3)) if m else None
+
+def describe_dims(dims):
+    parts = [d if e == 1 else f"{d}^{e}" for d, e in zip(BASE_DIMS, dims) if e]
+    return "·".join(parts) or "dimensionless"
+
+def convert_array(values, cat, from_u, to_u, out=None):
+    # Whole array in one multiply-add; `out` may be the input itself for an in-place conversion
+    scale, offset = conversion(cat, from_u, to_u)
+    if np is None:
+        return [v * scale + offset for v in values]
+    arr = np.asarray(values, dtype=np.float64)
+    out = np.multiply(arr, scale, out=out)
+    if offset:
+        out += offset
+    return out
+
+def _format(v, precision):
+    return repr(v) if precision is None else f"{v:.{precision}g}"
+
+def _convert_cells(cells, scale, offset, precision):
+    try:
+        if np is not None:
+            values = (np.array(cells, dtype=np.float64) * scale + offset).tolist()
+        else:
+            values = [float(c) * scale + offset for c in cells]
+    except ValueError:
+        # Blank or non-numeric cells in this chunk: convert what parses, leave the rest as is
+        out = []
+        for c in cells:
+            try:
+                out.append(_format(float(c) * scale + offset, precision))
+            except ValueError:
+                out.append(c)
+        return out
+    return [_format(v, precision) for v in values]
+
+def convert_csv(in_path, out_path, columns, scale, offset, chunk_rows=100000, precision=None, delimiter=","):
+    # Streams in_path chunk by chunk, so memory stays flat however long the file is. Columns are
+    # header names or 0-based indexes; out_path "-" writes to stdout.
+    with open(in_path, newline="") as fin:
+        reader = csv.reader(fin, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return 0
+        idx = []
+        for c in columns:
+            if c in header:
+                idx.append(header.index(c))
+            elif c.isdigit() and int(c) < len(header):
+                idx.append(int(c))
+            else:
+                raise ValueError(f"{in_path}: no column {c!r}")
+        fout = sys.stdout if out_path == "-" else open(out_path, "w", newline="")
+        try:
+            writer = csv.writer(fout, delimiter=delimiter)
+            writer.writerow(header)
+            rows_done = 0
+            while True:
+                rows = list(itertools.islice(reader, chunk_rows))
+                if not rows:
+                    break
+                for c in idx:
+                    cells = [r[c] if c < len(r) else "" for r in rows]
+                    for r, v in zip(rows, _convert_cells(cells, scale, offset, precision)):
+                        if c < len(r):
+                            r[c] = v
+                writer.writerows(rows)
+                rows_done += len(rows)
+        finally:
+            if fout is not sys.stdout:
+                fout.close()
+    return rows_done
+
+def _convert_job(args):
+    return convert_csv(*args)
+
+def output_path(in_path, out_dir=None):
+    stem, ext = os.path.splitext(os.path.basename(in_path))
+    return os.path.join(out_dir or os.path.dirname(in_path), f"{stem}.converted{ext or '.csv'}")
+
+def convert_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Convert unit columns of CSV files.")
+    parser.add_argument("category", choices=list(UNIT_CATEGORIES))
+    parser.add_argument("from_unit")
+    parser.add_argument("to_unit")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--columns", "-c", nargs="+", required=True, help="header names or 0-based indexes")
+    parser.add_argument("--output", "-o", help="output file for a single input (default: stdout)")
+    parser.add_argument("--output-dir", help="where NAME.converted.csv files go (default: next to each input)")
+    parser.add_argument("--workers", type=int, default=1, help="convert several files in parallel processes")
+    parser.add_argument("--chunk-rows", type=int, default=100000)
+    parser.add_argument("--precision", type=int, help="significant digits (default: shortest exact repr)")
+    parser.add_argument("--delimiter", default=",")
+    args = parser.parse_args(argv)
+    load_custom_units()
+    units = UNIT_CATEGORIES[args.category]
+    for u in (args.from_unit, args.to_unit):
+        if u not in units:
+            parser.error(f"unknown {args.category} unit {u!r} (choose from {', '.join(units)})")
+    # Workers only get the compiled pair, so custom units work without reloading them per process
+    scale, offset = conversion(args.category, args.from_unit, args.to_unit)
+    if len(args.files) == 1 and not args.output_dir:
+        outputs = [args.output or "-"]
+    else:
+        outputs = [output_path(f, args.output_dir) for f in args.files]
+    jobs = [(f, out, args.columns, scale, offset, args.chunk_rows, args.precision, args.delimiter)
+            for f, out in zip(args.files, outputs)]
+    try:
+        if args.workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(args.workers) as pool:
+                counts = list(pool.map(_convert_job, jobs))
+        else:
+            counts = [_convert_job(job) for job in jobs]
+    except ValueError as e:
+        parser.error(str(e))
+    for f, out, n in zip(args.files, outputs, counts):
+        if out != "-":
+            print(f"{f}: {n:,} rows -> {out}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(convert_cli())